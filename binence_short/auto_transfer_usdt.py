@@ -4,9 +4,6 @@
 """
 
 import sys
-import requests
-import hmac
-import hashlib
 import time
 from pathlib import Path
 from urllib.parse import urlencode
@@ -35,14 +32,14 @@ class AutoUSDTTransfer:
             'use_testnet': False
         }
         self.exchange = ExchangeInterface(exchange_config)
+        
+        # 거래소 인터페이스의 HTTP 세션을 공유해 연결 풀과 API 키 헤더를 재사용
+        # (POST 폼 요청의 Content-Type 은 requests 가 자동 설정)
+        self.session = self.exchange.http_session
     
     def _generate_signature(self, query_string):
-        """바이낸스 API 서명 생성"""
-        return hmac.new(
-            self.secret_key.encode('utf-8'),
-            query_string.encode('utf-8'),
-            hashlib.sha256
-        ).hexdigest()
+        """바이낸스 API 서명 생성 (거래소 인터페이스의 서명 컨텍스트 재사용)"""
+        return self.exchange.sign_query(query_string)
     
     def _make_request(self, endpoint, params=None, method='GET'):
         """바이낸스 API 요청"""
@@ -59,19 +56,13 @@ class AutoUSDTTransfer:
         signature = self._generate_signature(query_string)
         params['signature'] = signature
         
-        # 헤더 설정
-        headers = {
-            'X-MBX-APIKEY': self.api_key,
-            'Content-Type': 'application/x-www-form-urlencoded'
-        }
-        
         # 요청 실행
         url = f"{self.base_url}{endpoint}"
         
         if method == 'POST':
-            response = requests.post(url, data=params, headers=headers)
+            response = self.session.post(url, data=params)
         else:
-            response = requests.get(url, params=params, headers=headers)
+            response = self.session.get(url, params=params)
         
         return response
     
@@ -58,8 +58,9 @@ class HybridTradingBotV2:
         self.hybrid_strategy = HybridPortfolioStrategy(hybrid_config)
         
         # 상태 추적
-        self.last_portfolio_update = datetime.now()
-        self.last_telegram_summary = datetime.now()
+        # 주기 알림 간격 확인용 (time.monotonic 기준 초)
+        self.last_portfolio_update = time.monotonic()
+        self.last_telegram_summary = time.monotonic()
         self.performance_metrics = {
             'total_trades': 0,
             'successful_trades': 0,
@@ -595,7 +596,7 @@ class HybridTradingBotV2:
             """.strip()
             
             # self.telegram.telegram.send_message(message)  # 기존 시스템 비활성화
-            self.last_portfolio_update = datetime.now()
+            self.last_portfolio_update = time.monotonic()
             
         except Exception as e:
             self.logger.error(f"포트폴리오 업데이트 알림 실패: {e}")
@@ -615,7 +616,7 @@ class HybridTradingBotV2:
             }
             
             # self.telegram.send_daily_summary(summary_info)  # 기존 시스템 비활성화
-            self.last_telegram_summary = datetime.now()
+            self.last_telegram_summary = time.monotonic()
             
         except Exception as e:
             self.logger.error(f"일일 요약 전송 실패: {e}")
@@ -758,7 +759,7 @@ class HybridTradingBotV2:
     async def run_trading_cycle(self):
         """거래 사이클 실행"""
         try:
-            cycle_start = time.time()
+            cycle_start = time.monotonic()
             self.cycle_count += 1
             
             self.logger.info(f"=== 하이브리드 거래 사이클 #{self.cycle_count} 시작 ===")
@@ -815,12 +816,11 @@ class HybridTradingBotV2:
                     )
             
             # 5. 주기적 알림 (기존)
-            time_since_portfolio_update = datetime.now() - self.last_portfolio_update
-            if time_since_portfolio_update > timedelta(hours=2):  # 2시간마다
+            now = time.monotonic()
+            if now - self.last_portfolio_update > 7200.0:  # 2시간마다
                 self._send_portfolio_update()
             
-            time_since_daily_summary = datetime.now() - self.last_telegram_summary
-            if time_since_daily_summary > timedelta(hours=24):  # 24시간마다
+            if now - self.last_telegram_summary > 86400.0:  # 24시간마다
                 self._send_daily_summary()
             
             # 6. 새로운 텔레그램 알림 시스템
@@ -844,7 +844,7 @@ class HybridTradingBotV2:
             except Exception as e:
                 self.logger.error(f"텔레그램 알림 전송 실패: {e}")
             
-            cycle_duration = time.time() - cycle_start
+            cycle_duration = time.monotonic() - cycle_start
             self.logger.info(f"사이클 #{self.cycle_count} 완료: {cycle_duration:.2f}초, "
                            f"거래 {len(executed_trades)}개 실행")
             
@@ -2,8 +2,14 @@
 거래소 인터페이스 모듈
 """
 import ccxt
+import copy
+import hashlib
+import hmac
 import pandas as pd
+import requests
 import time
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 from typing import Dict, Any, List, Optional, Tuple
 from utils.logger import logger
 from utils.decorators import retry_on_network_error, rate_limit, log_execution_time
@@ -12,10 +18,51 @@ from utils.decorators import retry_on_network_error, rate_limit, log_execution_t
 class ExchangeInterface:
     """거래소 인터페이스 클래스"""
     
+    # 입금 주소 조회 실패 시 재시도 대기 시간 (초)
+    DEPOSIT_ADDRESS_RETRY_SECONDS = 60.0
+    # 스마트 지정가 주문 체결 대기 시간 및 폴링 간격 (초, 지수 백오프)
+    # 폴링 간격은 get_order_status 호출 제한(0.5회/초) 간격 이상으로 유지
+    SMART_LIMIT_FILL_TIMEOUT = 5.0
+    ORDER_POLL_BASE_SECONDS = 2.0
+    ORDER_POLL_MAX_SECONDS = 4.0
+    # 심볼 목록을 관리하는 거래소 유형
+    SYMBOL_EXCHANGE_TYPES = ('spot', 'future')
+    # get_balance 반환 필드
+    BALANCE_FIELDS = ('free', 'used', 'total')
+    # 가격 정보 캐시 유지 시간 (초)
+    TICKER_CACHE_TTL = 1.0
+    # 잔고 스냅샷 캐시 유지 시간 (초, 주문/취소/이체 시 즉시 무효화)
+    BALANCE_CACHE_TTL = 1.0
+    # 직접 API 호출용 HTTP 연결 풀 크기 및 재시도 설정 (재시도는 멱등 요청에만 적용)
+    HTTP_POOL_CONNECTIONS = 2
+    HTTP_POOL_MAXSIZE = 4
+    HTTP_RETRY_TOTAL = 2
+    HTTP_RETRY_BACKOFF = 0.2
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.spot_exchange = None
         self.futures_exchange = None
+        # 입금 주소 캐시 {(currency, network): address_info}
+        self._deposit_address_cache = {}
+        # 입금 주소 조회 실패 후 재시도 가능 시각 {(currency, network): monotonic seconds}
+        self._deposit_address_retry_at = {}
+        # 가격 정보 캐시 {(symbol, exchange_type): (monotonic seconds, ticker)}
+        self._ticker_cache = {}
+        # 잔고 스냅샷 캐시 {'spot' | 'future': (monotonic seconds, balance)}
+        self._balance_cache = {}
+        # 직접 API 호출용 HTTP 세션 (TLS 연결 재사용, 이체 스크립트와 공유)
+        self.http_session = requests.Session()
+        self.http_session.mount('https://', HTTPAdapter(
+            pool_connections=self.HTTP_POOL_CONNECTIONS,
+            pool_maxsize=self.HTTP_POOL_MAXSIZE,
+            max_retries=Retry(
+                total=self.HTTP_RETRY_TOTAL,
+                backoff_factor=self.HTTP_RETRY_BACKOFF,
+                status_forcelist=(500, 502, 503, 504),
+                raise_on_status=False
+            )
+        ))
         self.setup_exchanges()
     
     def setup_exchanges(self):
@@ -34,6 +81,9 @@ class ExchangeInterface:
             # API 키들을 인스턴스 변수로 저장
             self.api_key = api_key
             self.secret_key = secret_key
+            # 직접 API 호출 서명용 HMAC 컨텍스트 (키 스케줄을 한 번만 계산, 시크릿 키가 없으면 None)
+            self._signer = hmac.new(secret_key.encode('utf-8'), digestmod=hashlib.sha256) if secret_key else None
+            self.http_session.headers['X-MBX-APIKEY'] = api_key or ''
             
             # 현물 거래소 설정
             self.spot_exchange = ccxt.binance({
@@ -59,48 +109,78 @@ class ExchangeInterface:
                 }
             })
             
-            # 사용 가능한 심볼 목록 캐시
-            self._available_symbols = {'spot': set(), 'future': set()}
-            self._load_available_symbols()
+            # 사용 가능한 심볼 목록 캐시 (거래소 유형별로 처음 확인할 때 로드)
+            self._available_symbols = {}
             
             logger.info("거래소 연결 설정 완료")
         except Exception as e:
             logger.error(f"거래소 연결 설정 실패: {e}")
             raise
     
-    def _load_available_symbols(self):
+    def sign_query(self, query_string: str) -> str:
+        """바이낸스 직접 API 호출용 HMAC-SHA256 서명"""
+        if self._signer is None:
+            raise ValueError("시크릿 키가 설정되지 않아 API 요청에 서명할 수 없습니다")
+        signer = self._signer.copy()
+        signer.update(query_string.encode('utf-8'))
+        return signer.hexdigest()
+    
+    def _load_available_symbols(self, exchange_type: str) -> set:
         """사용 가능한 심볼 목록 로드"""
+        symbols = set()
         try:
-            # 현물 심볼 로드
-            if self.spot_exchange:
-                spot_markets = self.spot_exchange.load_markets()
-                self._available_symbols['spot'] = set(spot_markets.keys())
-                logger.info(f"현물 심볼 {len(self._available_symbols['spot'])}개 로드됨")
+            if exchange_type == 'spot':
+                exchange, label = self.spot_exchange, '현물'
+            else:
+                exchange, label = self.futures_exchange, '선물'
             
-            # 선물 심볼 로드
-            if self.futures_exchange:
-                futures_markets = self.futures_exchange.load_markets()
-                self._available_symbols['future'] = set(futures_markets.keys())
-                logger.info(f"선물 심볼 {len(self._available_symbols['future'])}개 로드됨")
+            if exchange:
+                markets = exchange.load_markets()
+                symbols = set(markets.keys())
+                logger.info(f"{label} 심볼 {len(symbols)}개 로드됨")
                 
         except Exception as e:
-            logger.error(f"심볼 목록 로드 실패: {e}")
+            logger.error(f"심볼 목록 로드 실패 ({exchange_type}): {e}")
             # 실패 시 빈 set 유지
+        
+        self._available_symbols[exchange_type] = symbols
+        return symbols
     
     def _is_symbol_available(self, symbol: str, exchange_type: str) -> bool:
         """심볼이 해당 거래소에서 사용 가능한지 확인"""
         try:
-            if exchange_type not in self._available_symbols:
+            if exchange_type not in self.SYMBOL_EXCHANGE_TYPES:
                 return False
-            return symbol in self._available_symbols[exchange_type]
+            symbols = self._available_symbols.get(exchange_type)
+            if symbols is None:
+                symbols = self._load_available_symbols(exchange_type)
+            return symbol in symbols
         except Exception:
             # 확인할 수 없으면 True 반환 (기존 동작 유지)
             return True
     
+    def _cached_balance(self, account: str) -> Optional[Dict[str, Any]]:
+        """유효한 잔고 스냅샷의 사본 반환 (없거나 만료되면 None, 호출 측 수정이 캐시에 번지지 않도록 복사)"""
+        cached = self._balance_cache.get(account)
+        if cached is not None and time.monotonic() - cached[0] < self.BALANCE_CACHE_TTL:
+            return copy.deepcopy(cached[1])
+        return None
+    
+    def invalidate_balance_cache(self):
+        """잔고 스냅샷 캐시 무효화"""
+        self._balance_cache.clear()
+    
+    def get_spot_balance(self) -> Dict[str, float]:
+        """현물 잔고 조회 (짧은 TTL 스냅샷 캐시)"""
+        cached = self._cached_balance('spot')
+        if cached is not None:
+            return cached
+        return self._fetch_spot_balance()
+    
     @retry_on_network_error(max_retries=3)
     @rate_limit(calls_per_second=0.5)
-    def get_spot_balance(self) -> Dict[str, float]:
-        """현물 잔고 조회"""
+    def _fetch_spot_balance(self) -> Dict[str, float]:
+        """거래소에서 현물 잔고 조회"""
         try:
             if not self.spot_exchange:
                 logger.error("현물 거래소 연결이 설정되지 않았습니다")
@@ -121,11 +201,13 @@ class ExchangeInterface:
                 if balance['total'].get(asset, 0) > 0:
                     logger.debug(f"현물 {asset}: {balance['total'][asset]}")
             
-            return {
+            result = {
                 'total': balance['total'],
                 'free': balance['free'],
                 'used': balance['used']
             }
+            self._balance_cache['spot'] = (time.monotonic(), copy.deepcopy(result))
+            return result
         except ccxt.AuthenticationError as e:
             logger.error(f"현물 API 키 인증 오류: {e}")
             return {'total': {'USDT': 0}, 'free': {'USDT': 0}, 'used': {'USDT': 0}}
@@ -137,31 +219,25 @@ class ExchangeInterface:
             logger.error(f"오류 타입: {type(e).__name__}")
             return {'total': {}, 'free': {}, 'used': {}}
     
+    def get_futures_balance(self) -> Dict[str, float]:
+        """선물 잔고 조회 (짧은 TTL 스냅샷 캐시)"""
+        cached = self._cached_balance('future')
+        if cached is not None:
+            return cached
+        return self._fetch_futures_balance()
+    
     @retry_on_network_error(max_retries=3)
     @rate_limit(calls_per_second=0.5)
-    def get_futures_balance(self) -> Dict[str, float]:
+    def _fetch_futures_balance(self) -> Dict[str, float]:
         """선물 잔고 조회 (직접 API 호출)"""
         try:
-            import requests
-            import time
-            import hmac
-            import hashlib
-            from urllib.parse import urlencode
-            
-            # 바이낸스 선물 API 직접 호출
-            timestamp = int(time.time() * 1000)
-            params = {'timestamp': timestamp}
-            query_string = urlencode(params)
-            signature = hmac.new(
-                self.secret_key.encode('utf-8'),
-                query_string.encode('utf-8'),
-                hashlib.sha256
-            ).hexdigest()
-            
-            headers = {'X-MBX-APIKEY': self.api_key}
+            # 바이낸스 선물 API 직접 호출 (파라미터가 타임스탬프뿐이라 바로 쿼리 문자열 구성)
+            query_string = f"timestamp={int(time.time() * 1000)}"
+            signature = self.sign_query(query_string)
+            
             url = f"https://fapi.binance.com/fapi/v2/balance?{query_string}&signature={signature}"
             
-            response = requests.get(url, headers=headers, timeout=10)
+            response = self.http_session.get(url, timeout=10)
             
             if response.status_code == 200:
                 futures_data = response.json()
@@ -177,17 +253,18 @@ class ExchangeInterface:
                     asset = balance['asset']
                     balance_amount = float(balance['balance'])
                     available = float(balance['availableBalance'])
+                    locked = balance_amount - available
                     
                     total[asset] = balance_amount
                     free[asset] = available
-                    used[asset] = balance_amount - available
+                    used[asset] = locked
                     
                     if balance_amount > 0:
                         balances_format.append({
                             'asset': asset,
                             'balance': str(balance_amount),
                             'free': str(available),
-                            'locked': str(balance_amount - available)
+                            'locked': str(locked)
                         })
                 
                 usdt_total = total.get('USDT', 0)
@@ -196,12 +273,14 @@ class ExchangeInterface:
                 
                 logger.info(f"선물 잔고 조회 성공 (직접 API): USDT 총액={usdt_total}, 사용가능={usdt_free}, 사용중={usdt_used}")
                 
-                return {
+                result = {
                     'total': total,
                     'free': free,
                     'used': used,
                     'balances': balances_format
                 }
+                self._balance_cache['future'] = (time.monotonic(), copy.deepcopy(result))
+                return result
             else:
                 logger.error(f"선물 API 직접 호출 실패: {response.status_code} - {response.text}")
                 return {'total': {'USDT': 0}, 'free': {'USDT': 0}, 'used': {'USDT': 0}, 'balances': []}
@@ -216,10 +295,23 @@ class ExchangeInterface:
             logger.error(f"오류 타입: {type(e).__name__}")
             return {'total': {}, 'free': {}, 'used': {}}
     
+    def get_ticker(self, symbol: str, exchange_type: str = 'spot') -> Dict[str, Any]:
+        """심볼 가격 정보 조회 (짧은 TTL 캐시)"""
+        key = (symbol, exchange_type)
+        cached = self._ticker_cache.get(key)
+        now = time.monotonic()
+        if cached is not None and now - cached[0] < self.TICKER_CACHE_TTL:
+            return dict(cached[1])  # 호출 측 수정이 캐시에 번지지 않도록 사본 반환
+        
+        ticker = self._fetch_ticker(symbol, exchange_type)
+        if ticker:
+            self._ticker_cache[key] = (time.monotonic(), dict(ticker))
+        return ticker
+    
     @retry_on_network_error(max_retries=3)
     @rate_limit(calls_per_second=1.0)
-    def get_ticker(self, symbol: str, exchange_type: str = 'spot') -> Dict[str, Any]:
-        """심볼 가격 정보 조회"""
+    def _fetch_ticker(self, symbol: str, exchange_type: str) -> Dict[str, Any]:
+        """거래소에서 심볼 가격 정보 조회"""
         try:
             exchange = self.spot_exchange if exchange_type == 'spot' else self.futures_exchange
             
@@ -319,6 +411,7 @@ class ExchangeInterface:
                 order = exchange.create_market_order(symbol, side, amount)
             else:
                 order = exchange.create_limit_order(symbol, side, amount, price)
+            self.invalidate_balance_cache()
             
             logger.info(f"주문 생성 완료: {symbol} {side} {amount} @ {price}")
             return {
@@ -409,6 +502,7 @@ class ExchangeInterface:
                         
                         if transfer_success:
                             logger.info("자동 이체 성공, 잔고 재확인...")
+                            self.invalidate_balance_cache()
                             # 잔고 재확인
                             balance = self.get_spot_balance() if exchange_type == 'spot' else self.get_futures_balance()
                             available_usdt = balance.get('free', {}).get('USDT', 0)
@@ -662,8 +756,6 @@ class ExchangeInterface:
                                   exchange_type: str) -> Dict[str, Any]:
         """스마트 지정가 주문 (최적 가격 자동 계산)"""
         try:
-            import time
-            
             # 현재 시장 상황 분석
             current_price = self._get_current_price(symbol, exchange_type)
             spread = self._get_bid_ask_spread(symbol, exchange_type)
@@ -679,8 +771,8 @@ class ExchangeInterface:
             
             # 5초 후에도 체결되지 않으면 가격 조정
             if order and order.get('id'):
-                time.sleep(5)
-                order_status = self.get_order_status(order['id'], symbol, exchange_type)
+                order_status = self._wait_for_order_fill(order['id'], symbol, exchange_type,
+                                                         self.SMART_LIMIT_FILL_TIMEOUT)
                 
                 if order_status.get('status') != 'closed':
                     # 주문 취소 후 더 공격적인 가격으로 재주문
@@ -699,6 +791,31 @@ class ExchangeInterface:
             logger.error(f"스마트 지정가 주문 실행 실패: {e}")
             return self.place_order(symbol, side, amount, None, 'market', exchange_type)
 
+    def _wait_for_order_fill(self, order_id: str, symbol: str, exchange_type: str,
+                             timeout: float) -> Dict[str, Any]:
+        """체결되거나 제한 시간이 지날 때까지 지수 백오프로 주문 상태 폴링
+
+        호출 간격은 폴링 간격으로 직접 제한하므로 rate_limit 이 적용되지 않은 조회를 사용해
+        전체 대기 시간이 timeout 을 넘지 않도록 한다.
+        """
+        deadline = time.monotonic() + timeout
+        order_status = {}
+        attempt = 0
+        
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            delay = min(self.ORDER_POLL_MAX_SECONDS, self.ORDER_POLL_BASE_SECONDS * (2 ** attempt))
+            time.sleep(min(delay, remaining))
+            attempt += 1
+            
+            order_status = self._fetch_order_status(order_id, symbol, exchange_type)
+            if order_status.get('status') == 'closed':
+                break
+        
+        return order_status
+
     def _get_current_price(self, symbol: str, exchange_type: str) -> float:
         """현재 가격 조회"""
         try:
@@ -728,6 +845,7 @@ class ExchangeInterface:
         try:
             exchange = self.spot_exchange if exchange_type == 'spot' else self.futures_exchange
             exchange.cancel_order(order_id, symbol)
+            self.invalidate_balance_cache()
             logger.info(f"주문 취소 완료: {order_id}")
             return True
         except Exception as e:
@@ -738,6 +856,10 @@ class ExchangeInterface:
     @rate_limit(calls_per_second=0.5)
     def get_order_status(self, order_id: str, symbol: str, exchange_type: str = 'spot') -> Dict[str, Any]:
         """주문 상태 조회"""
+        return self._fetch_order_status(order_id, symbol, exchange_type)
+    
+    def _fetch_order_status(self, order_id: str, symbol: str, exchange_type: str) -> Dict[str, Any]:
+        """거래소에서 주문 상태 조회 (호출 제한 없음)"""
         try:
             exchange = self.spot_exchange if exchange_type == 'spot' else self.futures_exchange
             order = exchange.fetch_order(order_id, symbol)
@@ -894,10 +1016,31 @@ class ExchangeInterface:
             logger.error(f"시장 정보 조회 실패 ({symbol}): {e}")
             return {}
     
+    def get_deposit_address(self, currency: str, network: str = None) -> Dict[str, Any]:
+        """입금 주소 조회 (세션 내 캐시 - 입금 주소는 변경되지 않음)"""
+        cache_key = (currency, network)
+        cached = self._deposit_address_cache.get(cache_key)
+        if cached:
+            return cached
+        
+        # 최근 조회 실패 시 재시도 대기 시간 동안 API 호출 생략
+        now = time.monotonic()
+        if now < self._deposit_address_retry_at.get(cache_key, 0.0):
+            logger.debug(f"입금 주소 조회 재시도 대기 중 ({currency})")
+            return {}
+        
+        address_info = self._fetch_deposit_address(currency, network)
+        if address_info.get('address'):
+            self._deposit_address_cache[cache_key] = address_info
+            self._deposit_address_retry_at.pop(cache_key, None)
+        else:
+            self._deposit_address_retry_at[cache_key] = now + self.DEPOSIT_ADDRESS_RETRY_SECONDS
+        return address_info
+    
     @retry_on_network_error(max_retries=3)
     @rate_limit(calls_per_second=0.5)
-    def get_deposit_address(self, currency: str, network: str = None) -> Dict[str, Any]:
-        """입금 주소 조회"""
+    def _fetch_deposit_address(self, currency: str, network: str = None) -> Dict[str, Any]:
+        """입금 주소 API 조회"""
         try:
             if not self.spot_exchange:
                 logger.error("현물 거래소 연결이 설정되지 않았습니다")
@@ -930,11 +1073,8 @@ class ExchangeInterface:
             balance = exchange.fetch_balance()
             
             if currency in balance:
-                return {
-                    'free': float(balance[currency]['free']),
-                    'used': float(balance[currency]['used']),
-                    'total': float(balance[currency]['total'])
-                }
+                entry = balance[currency]
+                return {key: float(entry[key]) for key in self.BALANCE_FIELDS}
             else:
                 return {'free': 0.0, 'used': 0.0, 'total': 0.0}
                 
@@ -5,10 +5,12 @@
 
 import sys
 import os
+import functools
+from operator import itemgetter
 from datetime import datetime, timedelta
+from types import MappingProxyType
 from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
-import pandas as pd
 
 # 프로젝트 루트를 Python 경로에 추가
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -16,9 +18,77 @@ sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from utils import logger
 
 
+def _to_float_column(values: List[Any], default: float) -> np.ndarray:
+    """값 목록을 float 배열로 일괄 변환 (None, 숫자가 아닌 값 및 ±inf는 default로 대체)"""
+    import pandas as pd  # 이 헬퍼에서만 사용하므로 지연 로드
+    
+    column = pd.to_numeric(np.array(values, dtype=object), errors='coerce')
+    return np.nan_to_num(np.asarray(column, dtype=np.float64), nan=default, posinf=default, neginf=default)
+
+
+@functools.lru_cache(maxsize=256)
+def _allocation_deviations(total_balance: float, spot_usdt: float, futures_usdt: float,
+                           spot_allocation: float, futures_allocation: float) -> Tuple[float, float, float, float]:
+    """현물/선물 비율과 목표 배분 대비 편차 (입력값 전체를 키로 캐시)"""
+    current_spot_ratio = spot_usdt / total_balance
+    current_futures_ratio = futures_usdt / total_balance
+    return (current_spot_ratio, current_futures_ratio,
+            abs(current_spot_ratio - spot_allocation), abs(current_futures_ratio - futures_allocation))
+
+
+# 자주 조회되는 심볼 키 (intern 하여 딕셔너리 조회 시 포인터 비교로 처리)
+BTC_USDT = sys.intern('BTC/USDT')
+ETH_USDT = sys.intern('ETH/USDT')
+
+# 초기 투자 기본 심볼 (유동성이 높고 안정적인 코인들)
+_PRIMARY_SYMBOLS = (BTC_USDT, ETH_USDT)
+
+# 선물 거래 지원 심볼 (바이낸스 기준)
+_FUTURES_SUPPORTED = frozenset({
+    BTC_USDT, ETH_USDT, 'BNB/USDT', 'XRP/USDT',
+    'SOL/USDT', 'ADA/USDT', 'AVAX/USDT', 'LINK/USDT',
+    'TRX/USDT'  # LTC, DOT, MATIC 제외
+})
+
+# 현물 심볼 -> 선물 심볼 매핑 (바이낸스 USDT-M 선물 형식)
+_FUTURES_MAPPING = MappingProxyType({
+    BTC_USDT: 'BTC/USDT:USDT',
+    ETH_USDT: 'ETH/USDT:USDT',
+    'BNB/USDT': 'BNB/USDT:USDT',
+    'XRP/USDT': 'XRP/USDT:USDT',
+    'SOL/USDT': 'SOL/USDT:USDT',
+    'ADA/USDT': 'ADA/USDT:USDT',
+    'AVAX/USDT': 'AVAX/USDT:USDT',
+    'LINK/USDT': 'LINK/USDT:USDT',
+    'TRX/USDT': 'TRX/USDT:USDT'
+})
+
+# 심볼별 (최소 거래 수량, 수량 소수점 자릿수) - 바이낸스 기준
+_SYMBOL_SPEC = MappingProxyType({
+    BTC_USDT: (0.00001, 5),     # 0.00001 BTC
+    ETH_USDT: (0.0001, 4),      # 0.0001 ETH
+    'BNB/USDT': (0.001, 4),     # 0.001 BNB
+    'XRP/USDT': (0.1, 2),       # 0.1 XRP
+    'SOL/USDT': (0.001, 4),     # 0.001 SOL
+    'ADA/USDT': (0.1, 2),       # 0.1 ADA
+    'AVAX/USDT': (0.01, 3),     # 0.01 AVAX
+    'LINK/USDT': (0.01, 3),     # 0.01 LINK
+    'DOT/USDT': (0.01, 3),      # 0.01 DOT
+    'MATIC/USDT': (0.1, 2),     # 0.1 MATIC
+    'TRX/USDT': (1.0, 3)        # 1.0 TRX
+})
+_DEFAULT_SYMBOL_SPEC = (0.001, 3)
+
+# 포지션 추적 대상 거래 유형
+_EXCHANGE_TYPES = frozenset({'spot', 'futures'})
+
+
 class HybridPortfolioStrategy:
     """현물 + 선물 하이브리드 포트폴리오 전략 클래스"""
     
+    # 최소 거래 금액 (바이낸스 최소 $5)
+    MIN_NOTIONAL_USDT = 5.0
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         
@@ -28,6 +98,8 @@ class HybridPortfolioStrategy:
         
         # 전략 설정 (매우 적극적 거래를 위한 초 민감 설정)
         self.arbitrage_threshold = config.get('arbitrage_threshold', 0.0005)  # 0.05% 프리미엄 (초민감)
+        # 신뢰도 계산 시 나눗셈 대신 곱셈을 사용하기 위한 역수
+        self._inv_arbitrage_threshold = 1.0 / self.arbitrage_threshold if self.arbitrage_threshold > 0 else 0.0
         self.rebalance_threshold = config.get('REBALANCE_THRESHOLD', 0.03)  # 3% 편차시 리밸런싱
         self.rebalance_interval_minutes = config.get('REBALANCE_INTERVAL_MINUTES', 15)  # 15분 간격
         self.auto_transfer_enabled = config.get('AUTO_TRANSFER_ENABLED', True)  # 자동 이체 활성화
@@ -43,25 +115,18 @@ class HybridPortfolioStrategy:
         self.portfolio_history = []
         self.last_rebalance = datetime.now()
         
-        # 선물 거래 지원 심볼 (바이낸스 기준)
-        self.futures_supported_symbols = [
-            'BTC/USDT', 'ETH/USDT', 'BNB/USDT', 'XRP/USDT', 
-            'SOL/USDT', 'ADA/USDT', 'AVAX/USDT', 'LINK/USDT', 
-            'TRX/USDT'  # LTC, DOT, MATIC 제외
-        ]
+        # 선물 거래 지원 심볼 및 현물 -> 선물 심볼 매핑 (모듈 상수 공유)
+        self.futures_supported_symbols = _FUTURES_SUPPORTED
+        self.futures_symbol_mapping = _FUTURES_MAPPING
         
-        # 현물 심볼 -> 선물 심볼 매핑 (바이낸스 USDT-M 선물 형식)
-        self.futures_symbol_mapping = {
-            'BTC/USDT': 'BTC/USDT:USDT',
-            'ETH/USDT': 'ETH/USDT:USDT', 
-            'BNB/USDT': 'BNB/USDT:USDT',
-            'XRP/USDT': 'XRP/USDT:USDT',
-            'SOL/USDT': 'SOL/USDT:USDT',
-            'ADA/USDT': 'ADA/USDT:USDT',
-            'AVAX/USDT': 'AVAX/USDT:USDT',
-            'LINK/USDT': 'LINK/USDT:USDT',
-            'TRX/USDT': 'TRX/USDT:USDT'
-        }
+        # 실행 중 변하지 않는 전략 요약 필드
+        self._static_summary = MappingProxyType({
+            'strategy_type': 'hybrid_spot_futures',
+            'spot_allocation': self.spot_allocation,
+            'futures_allocation': self.futures_allocation,
+            'arbitrage_threshold': self.arbitrage_threshold,
+            'max_leverage': self.max_leverage
+        })
         
         logger.info("하이브리드 포트폴리오 전략 초기화 완료")
     
@@ -75,85 +140,112 @@ class HybridPortfolioStrategy:
                 'momentum': []
             }
             
-            for symbol in market_data.keys():
-                if symbol not in market_data:
-                    continue
-                
+            # 루프에서 반복 참조하는 속성을 지역 변수로 바인딩
+            arb_thr = self.arbitrage_threshold
+            inv_arb_thr = self._inv_arbitrage_threshold
+            spot_positions = self.current_positions['spot']
+            
+            symbols = list(market_data.keys())
+            
+            # 원시 값 컬럼 수집 (타입 변환과 신뢰도는 아래에서 벡터 연산으로 일괄 처리)
+            raw_spot_prices = []
+            raw_futures_prices = []
+            raw_spot_strengths = []
+            raw_futures_strengths = []
+            raw_spot_rsis = []
+            raw_futures_rsis = []
+            
+            for symbol in symbols:
                 data = market_data[symbol]
-                spot_price = data.get('spot_ticker', {}).get('last', 0)
-                futures_price = data.get('futures_ticker', {}).get('last', 0)
+                raw_spot_prices.append(data.get('spot_ticker', {}).get('last', 0))
+                raw_futures_prices.append(data.get('futures_ticker', {}).get('last', 0))
                 
-                # Null 체크 및 타입 검증
-                if spot_price is None:
-                    spot_price = 0
-                if futures_price is None:
-                    futures_price = 0
+                spot_signals = data.get('spot_signals', {})
+                futures_signals = data.get('futures_signals', {})
+                if spot_signals and futures_signals:
+                    raw_spot_strengths.append(spot_signals.get('combined_signal', 0))
+                    raw_futures_strengths.append(futures_signals.get('combined_signal', 0))
+                else:
+                    raw_spot_strengths.append(0)
+                    raw_futures_strengths.append(0)
                 
-                # 숫자가 아닌 경우 0으로 설정
-                try:
-                    spot_price = float(spot_price)
-                    futures_price = float(futures_price)
-                except (TypeError, ValueError):
-                    spot_price = 0
-                    futures_price = 0
+                spot_indicators = data.get('spot_indicators', {})
+                futures_indicators = data.get('futures_indicators', {})
+                if spot_indicators and futures_indicators:
+                    raw_spot_rsis.append(spot_indicators.get('rsi', {}).get('current', 50))
+                    raw_futures_rsis.append(futures_indicators.get('rsi', {}).get('current', 50))
+                else:
+                    raw_spot_rsis.append(50)
+                    raw_futures_rsis.append(50)
+            
+            # Null, 숫자가 아닌 값 및 무한대는 기본값으로 대체
+            spot_prices = _to_float_column(raw_spot_prices, 0.0)
+            futures_prices = _to_float_column(raw_futures_prices, 0.0)
+            spot_strengths = _to_float_column(raw_spot_strengths, 0.0)
+            futures_strengths = _to_float_column(raw_futures_strengths, 0.0)
+            spot_rsis = _to_float_column(raw_spot_rsis, 50.0)
+            futures_rsis = _to_float_column(raw_futures_rsis, 50.0)
+            
+            # 프리미엄 및 신뢰도 일괄 계산 (분기 없는 벡터 연산)
+            valid = (spot_prices > 0) & (futures_prices > 0)
+            premiums = np.divide(futures_prices - spot_prices, spot_prices,
+                                 out=np.zeros_like(spot_prices), where=valid)
+            abs_premiums = np.abs(premiums)
+            arb_confidences = np.minimum(abs_premiums * inv_arb_thr, 1.0)
+            momentum_confidences = np.abs(50.0 - spot_rsis) / 50.0
+            
+            valid = valid.tolist()
+            premiums = premiums.tolist()
+            abs_premiums = abs_premiums.tolist()
+            arb_confidences = arb_confidences.tolist()
+            momentum_confidences = momentum_confidences.tolist()
+            spot_prices = spot_prices.tolist()
+            futures_prices = futures_prices.tolist()
+            spot_strengths = spot_strengths.tolist()
+            futures_strengths = futures_strengths.tolist()
+            spot_rsis = spot_rsis.tolist()
+            futures_rsis = futures_rsis.tolist()
+            
+            for i, symbol in enumerate(symbols):
+                spot_price = spot_prices[i]
+                futures_price = futures_prices[i]
                 
-                if spot_price <= 0 or futures_price <= 0:
+                if not valid[i]:
                     logger.debug(f"[DEBUG] 가격 데이터 부족으로 스킵: {symbol} - spot: {spot_price}, futures: {futures_price}")
                     continue
                 
                 logger.debug(f"[DEBUG] 처리 중인 심볼: {symbol} - spot: {spot_price}, futures: {futures_price}")
                 
                 # 1. 아비트라지 기회 분석
-                premium = (futures_price - spot_price) / spot_price
-                if abs(premium) > self.arbitrage_threshold:
+                premium = premiums[i]
+                if abs_premiums[i] > arb_thr:
                     opportunities['arbitrage'].append({
                         'symbol': symbol,
                         'premium': premium,
                         'spot_price': spot_price,
                         'futures_price': futures_price,
                         'opportunity_type': 'long_spot_short_futures' if premium > 0 else 'short_spot_long_futures',
-                        'expected_profit': abs(premium),
-                        'confidence': min(abs(premium) / self.arbitrage_threshold, 1.0)
+                        'expected_profit': abs_premiums[i],
+                        'confidence': arb_confidences[i]
                     })
                 
                 # 2. 트렌드 추종 기회
-                spot_signals = data.get('spot_signals', {})
-                futures_signals = data.get('futures_signals', {})
-                
-                # 시그널 강도 초기화 (범위 밖에서도 사용되므로)
-                spot_strength = 0
-                futures_strength = 0
+                spot_strength = spot_strengths[i]
+                futures_strength = futures_strengths[i]
                 
-                if spot_signals and futures_signals:
-                    spot_strength = spot_signals.get('combined_signal', 0)
-                    futures_strength = futures_signals.get('combined_signal', 0)
-                    
-                    # Null 체크 및 타입 검증
-                    if spot_strength is None:
-                        spot_strength = 0
-                    if futures_strength is None:
-                        futures_strength = 0
-                    
-                    try:
-                        spot_strength = float(spot_strength)
-                        futures_strength = float(futures_strength)
-                    except (TypeError, ValueError):
-                        spot_strength = 0
-                        futures_strength = 0
-                    
-                    # 현물과 선물 신호가 같은 방향이면 트렌드 추종 (매우 민감하게)
-                    if abs(spot_strength) > 0.1 and abs(futures_strength) > 0.1:
-                        if (spot_strength > 0 and futures_strength > 0) or (spot_strength < 0 and futures_strength < 0):
-                            opportunities['trend_following'].append({
-                                'symbol': symbol,
-                                'direction': 'bullish' if spot_strength > 0 else 'bearish',
-                                'spot_strength': spot_strength,
-                                'futures_strength': futures_strength,
-                                'confidence': (abs(spot_strength) + abs(futures_strength)) / 2
-                            })
+                # 현물과 선물 신호가 같은 방향이면 트렌드 추종 (매우 민감하게)
+                if abs(spot_strength) > 0.1 and abs(futures_strength) > 0.1:
+                    if (spot_strength > 0 and futures_strength > 0) or (spot_strength < 0 and futures_strength < 0):
+                        opportunities['trend_following'].append({
+                            'symbol': symbol,
+                            'direction': 'bullish' if spot_strength > 0 else 'bearish',
+                            'spot_strength': spot_strength,
+                            'futures_strength': futures_strength,
+                            'confidence': (abs(spot_strength) + abs(futures_strength)) / 2
+                        })
                 
                 # 3. 헤징 기회 (현물 보유시 선물로 헤지) - 매우 민감하게
-                current_spot_position = self.current_positions['spot'].get(symbol, {})
+                current_spot_position = spot_positions.get(symbol, {})
                 if current_spot_position and abs(futures_strength) > 0.2:
                     if (current_spot_position.get('side') == 'buy' and futures_strength < -0.2) or \
                        (current_spot_position.get('side') == 'sell' and futures_strength > 0.2):
@@ -166,35 +258,18 @@ class HybridPortfolioStrategy:
                         })
                 
                 # 4. 모멘텀 기회 (급격한 가격 변동 활용)
-                spot_indicators = data.get('spot_indicators', {})
-                futures_indicators = data.get('futures_indicators', {})
+                spot_rsi = spot_rsis[i]
+                futures_rsi = futures_rsis[i]
                 
-                if spot_indicators and futures_indicators:
-                    spot_rsi = spot_indicators.get('rsi', {}).get('current', 50)
-                    futures_rsi = futures_indicators.get('rsi', {}).get('current', 50)
-                    
-                    # Null 체크 및 타입 검증
-                    if spot_rsi is None:
-                        spot_rsi = 50
-                    if futures_rsi is None:
-                        futures_rsi = 50
-                    
-                    try:
-                        spot_rsi = float(spot_rsi)
-                        futures_rsi = float(futures_rsi)
-                    except (TypeError, ValueError):
-                        spot_rsi = 50
-                        futures_rsi = 50
-                    
-                    # RSI 극값에서 모멘텀 기회 (매우 민감하게)
-                    if (spot_rsi < 40 and futures_rsi < 40) or (spot_rsi > 60 and futures_rsi > 60):
-                        opportunities['momentum'].append({
-                            'symbol': symbol,
-                            'type': 'oversold_bounce' if spot_rsi < 30 else 'overbought_correction',
-                            'spot_rsi': spot_rsi,
-                            'futures_rsi': futures_rsi,
-                            'confidence': abs(50 - spot_rsi) / 50
-                        })
+                # RSI 극값에서 모멘텀 기회 (매우 민감하게)
+                if (spot_rsi < 40 and futures_rsi < 40) or (spot_rsi > 60 and futures_rsi > 60):
+                    opportunities['momentum'].append({
+                        'symbol': symbol,
+                        'type': 'oversold_bounce' if spot_rsi < 30 else 'overbought_correction',
+                        'spot_rsi': spot_rsi,
+                        'futures_rsi': futures_rsi,
+                        'confidence': momentum_confidences[i]
+                    })
             
             return opportunities
             
@@ -209,6 +284,10 @@ class HybridPortfolioStrategy:
         try:
             signals = []
             
+            # 루프에서 반복 참조하는 속성을 지역 변수로 바인딩
+            futures_set = self.futures_supported_symbols
+            futures_map = self.futures_symbol_mapping
+            
             # 실제 사용 가능한 잔고 사용
             spot_free_balance = portfolio_state.get('spot_free_balance', 0)
             futures_free_balance = portfolio_state.get('futures_free_balance', 0)
@@ -224,20 +303,17 @@ class HybridPortfolioStrategy:
             arbitrage_opportunities = opportunities.get('arbitrage', [])
             logger.info(f"아비트라지 기회 분석: {len(arbitrage_opportunities)}개 발견")
             
-            for i, arb in enumerate(sorted(arbitrage_opportunities, key=lambda x: x['expected_profit'], reverse=True)):
+            # 사용 가능한 잔고에 맞춰 동적 조정 (루프 불변값이므로 한 번만 계산)
+            # 잔고 부족 시 거래 중단, 아니면 잔고의 80% 또는 최대 $100
+            spot_cap = 0 if spot_free_balance < 5 else min(spot_free_balance * 0.8, 100)
+            futures_cap = 0 if futures_free_balance < 5 else min(futures_free_balance * 0.8, 100)
+            
+            for i, arb in enumerate(sorted(arbitrage_opportunities, key=itemgetter('expected_profit'), reverse=True)):
                 logger.info(f"아비트라지 #{i+1}: {arb['symbol']} - 신뢰도: {arb['confidence']:.3f}, 수익률: {arb['expected_profit']:.4f}")
                 
                 if arb['confidence'] >= 0.25:  # 임계값을 25% 이상으로 수정 (경계값 포함)
-                    # 사용 가능한 잔고에 맞춰 동적 조정
-                    if spot_free_balance < 5:
-                        max_spot_amount = 0  # 잔고 부족 시 현물 거래 중단
-                    else:
-                        max_spot_amount = min(spot_free_balance * 0.8, 100)  # 잔고의 80% 또는 최대 $100
-                    
-                    if futures_free_balance < 5:
-                        max_futures_amount = 0  # 잔고 부족 시 선물 거래 중단
-                    else:
-                        max_futures_amount = min(futures_free_balance * 0.8, 100)  # 잔고의 80% 또는 최대 $100
+                    max_spot_amount = spot_cap
+                    max_futures_amount = futures_cap
                     
                     logger.debug(f"계산된 투자 금액 - 현물: ${max_spot_amount:.2f}, 선물: ${max_futures_amount:.2f}")
                     
@@ -263,55 +339,51 @@ class HybridPortfolioStrategy:
                     logger.debug(f"신뢰도 부족으로 스킵: {arb['symbol']} - 신뢰도: {arb['confidence']:.3f} < 0.3")
                     
                     # 선물 지원 여부 확인
-                    if arb['symbol'] in self.futures_supported_symbols:
-                        futures_symbol = self.futures_symbol_mapping.get(arb['symbol'], arb['symbol'])
+                    if arb['symbol'] in futures_set:
+                        futures_symbol = futures_map.get(arb['symbol'], arb['symbol'])
                         
                         if arb['opportunity_type'] == 'long_spot_short_futures':
-                            signals.extend([
-                                {
-                                    'strategy': 'arbitrage',
-                                    'symbol': arb['symbol'],
-                                    'exchange_type': 'spot',
-                                    'action': 'buy',
-                                    'size': spot_quantity,
-                                    'confidence': arb['confidence'],
-                                    'expected_return': arb['expected_profit'],
-                                    'priority': 1
-                                },
-                                {
-                                    'strategy': 'arbitrage',
-                                    'symbol': futures_symbol,  # 올바른 선물 심볼 사용
-                                    'exchange_type': 'futures',
-                                    'action': 'sell',
-                                    'size': futures_quantity,
-                                    'confidence': arb['confidence'],
-                                    'expected_return': arb['expected_profit'],
-                                    'priority': 1
-                                }
-                            ])
+                            signals.append({
+                                'strategy': 'arbitrage',
+                                'symbol': arb['symbol'],
+                                'exchange_type': 'spot',
+                                'action': 'buy',
+                                'size': spot_quantity,
+                                'confidence': arb['confidence'],
+                                'expected_return': arb['expected_profit'],
+                                'priority': 1
+                            })
+                            signals.append({
+                                'strategy': 'arbitrage',
+                                'symbol': futures_symbol,  # 올바른 선물 심볼 사용
+                                'exchange_type': 'futures',
+                                'action': 'sell',
+                                'size': futures_quantity,
+                                'confidence': arb['confidence'],
+                                'expected_return': arb['expected_profit'],
+                                'priority': 1
+                            })
                         else:
-                            signals.extend([
-                                {
-                                    'strategy': 'arbitrage',
-                                    'symbol': arb['symbol'],
-                                    'exchange_type': 'spot',
-                                    'action': 'sell',
-                                    'size': spot_quantity,
-                                    'confidence': arb['confidence'],
-                                    'expected_return': arb['expected_profit'],
-                                    'priority': 1
-                                },
-                                {
-                                    'strategy': 'arbitrage',
-                                    'symbol': futures_symbol,  # 올바른 선물 심볼 사용
-                                    'exchange_type': 'futures',
-                                    'action': 'buy',
-                                    'size': futures_quantity,
-                                    'confidence': arb['confidence'],
-                                    'expected_return': arb['expected_profit'],
-                                    'priority': 1
-                                }
-                            ])
+                            signals.append({
+                                'strategy': 'arbitrage',
+                                'symbol': arb['symbol'],
+                                'exchange_type': 'spot',
+                                'action': 'sell',
+                                'size': spot_quantity,
+                                'confidence': arb['confidence'],
+                                'expected_return': arb['expected_profit'],
+                                'priority': 1
+                            })
+                            signals.append({
+                                'strategy': 'arbitrage',
+                                'symbol': futures_symbol,  # 올바른 선물 심볼 사용
+                                'exchange_type': 'futures',
+                                'action': 'buy',
+                                'size': futures_quantity,
+                                'confidence': arb['confidence'],
+                                'expected_return': arb['expected_profit'],
+                                'priority': 1
+                            })
                     else:
                         # 선물 지원 안되면 현물만
                         signals.append({
@@ -328,7 +400,7 @@ class HybridPortfolioStrategy:
             # 2. 트렌드 추종 신호
             trend_opportunities = opportunities.get('trend_following', [])
             logger.info(f"트렌드 기회 상세 분석:")
-            for i, trend in enumerate(sorted(trend_opportunities, key=lambda x: x['confidence'], reverse=True)):
+            for i, trend in enumerate(sorted(trend_opportunities, key=itemgetter('confidence'), reverse=True)):
                 logger.info(f"  트렌드 #{i+1}: {trend['symbol']} - 신뢰도: {trend['confidence']:.3f}, 방향: {trend.get('direction', 'N/A')}")
                 
                 if trend['confidence'] >= 0.25:  # 임계값을 25% 이상으로 수정 (경계값 포함)
@@ -378,8 +450,8 @@ class HybridPortfolioStrategy:
                     })
                     
                     # 선물 지원 시에만 선물 신호 추가
-                    if trend['symbol'] in self.futures_supported_symbols and futures_size > 0:
-                        futures_symbol = self.futures_symbol_mapping.get(trend['symbol'], trend['symbol'])
+                    if trend['symbol'] in futures_set and futures_size > 0:
+                        futures_symbol = futures_map.get(trend['symbol'], trend['symbol'])
                         signals.append({
                             'strategy': 'trend_following',
                             'symbol': futures_symbol,  # 올바른 선물 심볼 사용
@@ -409,7 +481,7 @@ class HybridPortfolioStrategy:
                     })
             
             # 4. 모멘텀 신호 (소규모)
-            for momentum in sorted(opportunities['momentum'], key=lambda x: x['confidence'], reverse=True):
+            for momentum in sorted(opportunities['momentum'], key=itemgetter('confidence'), reverse=True):
                 if momentum['confidence'] > 0.5:
                     # 현재 가격 가져오기
                     symbol_data = market_data.get(momentum['symbol'], {}) if market_data else {}
@@ -440,8 +512,8 @@ class HybridPortfolioStrategy:
                                 'priority': 4
                             })
                         
-                        if futures_quantity > 0 and momentum['symbol'] in self.futures_supported_symbols:
-                            futures_symbol = self.futures_symbol_mapping.get(momentum['symbol'], momentum['symbol'])
+                        if futures_quantity > 0 and momentum['symbol'] in futures_set:
+                            futures_symbol = futures_map.get(momentum['symbol'], momentum['symbol'])
                             signals.append({
                                 'strategy': 'momentum',
                                 'symbol': futures_symbol,  # 올바른 선물 심볼 사용
@@ -453,10 +525,10 @@ class HybridPortfolioStrategy:
                             })
                     else:
                         # 과매수 조정 기대 - 숏 포지션 (선물만)
-                        if momentum['symbol'] in self.futures_supported_symbols:
+                        if momentum['symbol'] in futures_set:
                             futures_quantity = self._calculate_safe_quantity(momentum['symbol'], max_momentum_amount, current_price, 'futures')
                             if futures_quantity > 0:
-                                futures_symbol = self.futures_symbol_mapping.get(momentum['symbol'], momentum['symbol'])
+                                futures_symbol = futures_map.get(momentum['symbol'], momentum['symbol'])
                                 signals.append({
                                     'strategy': 'momentum',
                                     'symbol': futures_symbol,  # 올바른 선물 심볼 사용
@@ -468,7 +540,7 @@ class HybridPortfolioStrategy:
                                 })
             
             # 우선순위별 정렬
-            signals.sort(key=lambda x: x['priority'])
+            signals.sort(key=itemgetter('priority'))
             
             return signals[:10]  # 최대 10개 신호만
             
@@ -488,12 +560,9 @@ class HybridPortfolioStrategy:
                 logger.debug(f"잔고가 너무 적어 리밸런싱 불필요: ${total_balance:.2f}")
                 return False
             
-            # USDT만 보유한 경우의 비율 계산
-            current_spot_ratio = spot_usdt / total_balance
-            current_futures_ratio = futures_usdt / total_balance
-            
-            spot_deviation = abs(current_spot_ratio - self.spot_allocation)
-            futures_deviation = abs(current_futures_ratio - self.futures_allocation)
+            # USDT만 보유한 경우의 비율 계산 (잔고와 목표 배분이 같으면 캐시된 결과 사용)
+            current_spot_ratio, current_futures_ratio, spot_deviation, futures_deviation = _allocation_deviations(
+                total_balance, spot_usdt, futures_usdt, self.spot_allocation, self.futures_allocation)
             
             # 시간 기반 리밸런싱 조건 개선 (설정 기반)
             time_passed = datetime.now() - self.last_rebalance
@@ -614,85 +683,49 @@ class HybridPortfolioStrategy:
     
     def update_positions(self, symbol: str, exchange_type: str, position_data: Dict[str, Any]):
         """포지션 업데이트"""
-        try:
-            if exchange_type in ['spot', 'futures']:
-                self.current_positions[exchange_type][symbol] = position_data
-                logger.debug(f"포지션 업데이트: {exchange_type} {symbol}")
-        except Exception as e:
-            logger.error(f"포지션 업데이트 실패: {e}")
+        if exchange_type in _EXCHANGE_TYPES:
+            self.current_positions[exchange_type][symbol] = position_data
+            logger.debug(f"포지션 업데이트: {exchange_type} {symbol}")
     
     def remove_position(self, symbol: str, exchange_type: str):
         """포지션 제거"""
-        try:
-            if exchange_type in ['spot', 'futures'] and symbol in self.current_positions[exchange_type]:
-                del self.current_positions[exchange_type][symbol]
-                logger.debug(f"포지션 제거: {exchange_type} {symbol}")
-        except Exception as e:
-            logger.error(f"포지션 제거 실패: {e}")
+        if exchange_type in _EXCHANGE_TYPES and symbol in self.current_positions[exchange_type]:
+            del self.current_positions[exchange_type][symbol]
+            logger.debug(f"포지션 제거: {exchange_type} {symbol}")
     
     def _calculate_safe_quantity(self, symbol: str, max_amount: float, price: float, exchange_type: str) -> float:
         """안전한 거래 수량 계산 (최소 정밀도 및 거래 금액 준수)"""
-        try:
-            if price <= 0 or max_amount <= 0:
-                return 0.0
-            
-            # 심볼별 최소 거래 수량 설정 (바이낸스 기준)
-            min_quantities = {
-                'BTC/USDT': 0.00001,   # 0.00001 BTC
-                'ETH/USDT': 0.0001,    # 0.0001 ETH
-                'BNB/USDT': 0.001,     # 0.001 BNB
-                'XRP/USDT': 0.1,       # 0.1 XRP
-                'SOL/USDT': 0.001,     # 0.001 SOL
-                'ADA/USDT': 0.1,       # 0.1 ADA
-                'AVAX/USDT': 0.01,     # 0.01 AVAX
-                'LINK/USDT': 0.01,     # 0.01 LINK
-                'DOT/USDT': 0.01,      # 0.01 DOT
-                'MATIC/USDT': 0.1,     # 0.1 MATIC
-                'TRX/USDT': 1.0        # 1.0 TRX
-            }
-            
-            # 최소 거래 금액 (바이낸스 최소 $5)
-            min_notional = 5.0
-            
-            # 기본 최소 수량
-            min_quantity = min_quantities.get(symbol, 0.001)
-            
-            # 가격 기준 최대 구매 가능 수량
-            max_quantity = max_amount / price
-            
-            # 최소 수량 확인
-            if max_quantity < min_quantity:
-                logger.debug(f"최소 수량 미달: {symbol} - 필요: {min_quantity}, 가능: {max_quantity:.6f}")
-                return 0.0
-            
-            # 최소 거래 금액 확인
-            calculated_notional = max_quantity * price
-            if calculated_notional < min_notional:
-                logger.debug(f"최소 거래 금액 미달: {symbol} - 필요: ${min_notional}, 가능: ${calculated_notional:.2f}")
-                return 0.0
-            
-            # 안전한 수량 계산 (최소 수량의 정수배로 반올림)
-            safe_quantity = max(min_quantity, max_quantity)
-            
-            # 정밀도 조정 (소수점 자릿수 제한)
-            if symbol in ['BTC/USDT']:
-                safe_quantity = round(safe_quantity, 5)
-            elif symbol in ['ETH/USDT', 'BNB/USDT', 'SOL/USDT']:
-                safe_quantity = round(safe_quantity, 4)
-            elif symbol in ['AVAX/USDT', 'LINK/USDT', 'DOT/USDT']:
-                safe_quantity = round(safe_quantity, 3)
-            elif symbol in ['ADA/USDT', 'XRP/USDT', 'MATIC/USDT']:
-                safe_quantity = round(safe_quantity, 2)
-            else:
-                safe_quantity = round(safe_quantity, 3)
-            
-            logger.debug(f"수량 계산 완료: {symbol} - 금액: ${max_amount:.2f}, 가격: ${price:.4f}, 수량: {safe_quantity:.6f}")
-            
-            return safe_quantity
-            
-        except Exception as e:
-            logger.error(f"안전한 수량 계산 실패 ({symbol}): {e}")
+        if price <= 0 or max_amount <= 0:
+            return 0.0
+        
+        # 심볼별 최소 거래 수량 및 소수점 자릿수
+        min_quantity, ndigits = _SYMBOL_SPEC.get(symbol, _DEFAULT_SYMBOL_SPEC)
+        
+        min_notional = self.MIN_NOTIONAL_USDT
+        
+        # 가격 기준 최대 구매 가능 수량
+        max_quantity = max_amount / price
+        
+        # 최소 수량 확인
+        if max_quantity < min_quantity:
+            logger.debug(f"최소 수량 미달: {symbol} - 필요: {min_quantity}, 가능: {max_quantity:.6f}")
+            return 0.0
+        
+        # 최소 거래 금액 확인
+        calculated_notional = max_quantity * price
+        if calculated_notional < min_notional:
+            logger.debug(f"최소 거래 금액 미달: {symbol} - 필요: ${min_notional}, 가능: ${calculated_notional:.2f}")
             return 0.0
+        
+        # 안전한 수량 계산 (최소 수량의 정수배로 반올림)
+        safe_quantity = max(min_quantity, max_quantity)
+        
+        # 정밀도 조정 (소수점 자릿수 제한)
+        safe_quantity = round(safe_quantity, ndigits)
+        
+        logger.debug(f"수량 계산 완료: {symbol} - 금액: ${max_amount:.2f}, 가격: ${price:.4f}, 수량: {safe_quantity:.6f}")
+        
+        return safe_quantity
 
     def _generate_initial_purchase_orders(self, portfolio_state: Dict[str, Any]) -> List[Dict[str, Any]]:
         """초기 자산 구매 주문 생성 (USDT → 암호화폐)"""
@@ -702,7 +735,7 @@ class HybridPortfolioStrategy:
             current_prices = portfolio_state.get('current_prices', {})
             
             # 기본 투자 심볼들 (유동성이 높고 안정적인 코인들)
-            primary_symbols = ['BTC/USDT', 'ETH/USDT']
+            primary_symbols = _PRIMARY_SYMBOLS
             
             # 현물 투자 (목표 비율에서 현재 비율을 뺀 만큼)
             spot_target_investment = total_balance * (self.spot_allocation * 0.8)  # 80%만 초기 투자
@@ -710,10 +743,13 @@ class HybridPortfolioStrategy:
             # 심볼별 균등 분할
             per_symbol_amount = spot_target_investment / len(primary_symbols)
             
-            for symbol in primary_symbols:
-                current_price = current_prices.get(symbol, 0)
-                
-                if current_price <= 0:
+            # 심볼별 가격을 한 번에 추출 및 정규화 (None/비숫자/무한대 -> 0)
+            prices = _to_float_column([current_prices.get(symbol, 0) for symbol in primary_symbols], 0.0)
+            valid = (prices > 0).tolist()
+            prices = prices.tolist()
+            
+            for symbol, current_price, is_valid in zip(primary_symbols, prices, valid):
+                if not is_valid:
                     logger.warning(f"가격 정보 없음, 스킵: {symbol}")
                     continue
                 
@@ -741,11 +777,11 @@ class HybridPortfolioStrategy:
             futures_target_investment = total_balance * (self.futures_allocation * 0.3)  # 30%만 초기 투자
             
             if futures_target_investment >= 50:  # 최소 $50으로 완화
-                btc_price = current_prices.get('BTC/USDT', 0)
+                btc_price = current_prices.get(BTC_USDT, 0)
                 
                 if btc_price > 0:
                     # 선물은 BTC/USDT 형식으로 통일 (거래소 인터페이스에서 처리)
-                    futures_symbol = 'BTC/USDT'
+                    futures_symbol = BTC_USDT
                     safe_quantity = self._calculate_safe_quantity(futures_symbol, futures_target_investment, btc_price, 'futures')
                     
                     if safe_quantity > 0:
@@ -769,11 +805,7 @@ class HybridPortfolioStrategy:
     def get_strategy_summary(self) -> Dict[str, Any]:
         """전략 요약 정보 반환"""
         return {
-            'strategy_type': 'hybrid_spot_futures',
-            'spot_allocation': self.spot_allocation,
-            'futures_allocation': self.futures_allocation,
-            'arbitrage_threshold': self.arbitrage_threshold,
-            'max_leverage': self.max_leverage,
+            **self._static_summary,
             'current_positions': self.current_positions,
             'last_rebalance': self.last_rebalance.isoformat()
         }
\ No newline at end of file
@@ -3,6 +3,7 @@
 """
 import pandas as pd
 import numpy as np
+from collections import deque
 from typing import Dict, Any, List, Optional, Tuple
 from datetime import datetime, timedelta
 from utils.logger import logger
@@ -28,7 +29,8 @@ class PortfolioManager:
         
         # 포트폴리오 상태
         self.positions = {}
-        self.balance_history = []
+        # 잔고 기록 (최근 N개만 보관 - 초과분은 자동 제거)
+        self.balance_history = deque(maxlen=config.get('balance_history_max', 1000))
         self.trade_history = []
         self.performance_metrics = {}
         self.last_rebalance = None
@@ -145,10 +147,6 @@ class PortfolioManager:
                 'pnl_pct': (portfolio_value - self.initial_balance) / self.initial_balance * 100
             })
             
-            # 기록 제한 (최근 1000개만 보관)
-            if len(self.balance_history) > 1000:
-                self.balance_history = self.balance_history[-1000:]
-                
         except Exception as e:
             logger.error(f"잔고 기록 업데이트 실패: {e}")
     
@@ -162,10 +160,9 @@ class PortfolioManager:
             total_return = (portfolio_value - self.initial_balance) / self.initial_balance
             
             # 일일 수익률 계산
+            values = [record['total_value'] for record in self.balance_history]
             daily_returns = []
-            for i in range(1, len(self.balance_history)):
-                prev_value = self.balance_history[i-1]['total_value']
-                curr_value = self.balance_history[i]['total_value']
+            for prev_value, curr_value in zip(values, values[1:]):
                 if prev_value > 0:  # zero division 방지
                     daily_return = (curr_value - prev_value) / prev_value
                     daily_returns.append(daily_return)
@@ -545,16 +542,20 @@ class PortfolioManager:
             total_usdt_value = 0
             major_assets = ['BTC', 'ETH', 'BNB', 'XRP', 'TRX', 'LTC', 'USDT']
             
+            # balances 목록 형식이면 자산별 조회용 딕셔너리를 한 번만 구성 (중복 시 첫 항목 우선)
+            balances_by_asset = None
+            if 'balances' in spot_balance:
+                balances_by_asset = {balance.get('asset'): balance for balance in reversed(spot_balance['balances'])}
+            
             # 각 자산의 잔고와 현재 가격 조회
             for asset in major_assets:
                 asset_balance = 0
                 
                 # 자산 잔고 조회
-                if 'balances' in spot_balance:
-                    for balance in spot_balance['balances']:
-                        if balance.get('asset') == asset:
-                            asset_balance = float(balance.get('free', 0)) + float(balance.get('locked', 0))
-                            break
+                if balances_by_asset is not None:
+                    balance = balances_by_asset.get(asset)
+                    if balance is not None:
+                        asset_balance = float(balance.get('free', 0)) + float(balance.get('locked', 0))
                 elif 'total' in spot_balance and asset in spot_balance['total']:
                     asset_balance = float(spot_balance['total'][asset])
                 
@@ -720,10 +721,11 @@ class PortfolioManager:
             ]
             
             # 오래된 잔고 기록 정리
-            self.balance_history = [
-                record for record in self.balance_history 
-                if record['timestamp'] > cutoff_date
-            ]
+            self.balance_history = deque(
+                (record for record in self.balance_history 
+                 if record['timestamp'] > cutoff_date),
+                maxlen=self.balance_history.maxlen
+            )
             
             logger.info(f"오래된 기록 정리 완료: {days_to_keep}일 이전 데이터 삭제")
             
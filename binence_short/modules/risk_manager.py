@@ -1,17 +1,137 @@
 """
 리스크 관리 모듈
 """
+import time
+import random
+import logging
+import functools
+from collections import deque
+from dataclasses import dataclass
 import pandas as pd
 import numpy as np
 from typing import Dict, Any, List, Optional, Tuple
-from datetime import datetime, timedelta
+from datetime import datetime
 from utils.logger import logger
 from utils.decorators import log_execution_time
 
+# 시장 체제/유동성 코드 (조회 테이블 인덱스)
+REGIME_TRENDING, REGIME_RANGING, REGIME_VOLATILE, REGIME_NEUTRAL = range(4)
+LIQUIDITY_HIGH, LIQUIDITY_NORMAL, LIQUIDITY_LOW = range(3)
+
+# 문자열 → 코드 변환 (외부 입력 경계에서만 사용)
+_REGIME_IDS = {
+    'trending': REGIME_TRENDING,
+    'ranging': REGIME_RANGING,
+    'volatile': REGIME_VOLATILE,
+    'neutral': REGIME_NEUTRAL
+}
+_REGIME_NAMES = ('trending', 'ranging', 'volatile', 'neutral')
+_LIQUIDITY_IDS = {
+    'high': LIQUIDITY_HIGH,
+    'normal': LIQUIDITY_NORMAL,
+    'low': LIQUIDITY_LOW
+}
+
+# 포지션 방향/거래소 유형 비트 플래그: (side << 1) | exchange_type
+SIDE_BUY, SIDE_SELL = 0, 1
+EXCH_SPOT, EXCH_FUTURES = 0, 1
+SELL_FLAG = SIDE_SELL << 1
+FUTURES_FLAG = EXCH_FUTURES
+SHORT_FUTURES_FLAGS = SELL_FLAG | FUTURES_FLAG
+
+
+def _position_flags(side: str, exchange_type: str) -> int:
+    """포지션 방향/거래소 유형 문자열을 비트 플래그로 변환"""
+    side_code = SIDE_SELL if side == 'sell' else SIDE_BUY
+    exchange_code = EXCH_FUTURES if exchange_type == 'futures' else EXCH_SPOT
+    return (side_code << 1) | exchange_code
+
+
+@dataclass(slots=True)
+class RiskPosition:
+    """리스크 관리용 포지션 (SoA 버퍼 슬롯과 동기화)"""
+    symbol: str
+    side: str
+    size: float
+    price: float
+    exchange_type: str
+    flags: int
+    stop_loss_price: float
+    take_profit_price: float
+    entry_time: float  # unix timestamp
+    current_price: float
+    slot: int
+    unrealized_pnl: float = 0.0
+    last_update: Optional[datetime] = None
+
+
+# 심볼별 기본 승률 (과거 데이터 기반 추정)
+_BASE_WIN_RATES = {
+    'BTC/USDT': 0.58,
+    'ETH/USDT': 0.56,
+    'BNB/USDT': 0.54,
+    'XRP/USDT': 0.52,
+    'SOL/USDT': 0.55,
+    'ADA/USDT': 0.53,
+    'AVAX/USDT': 0.54,
+    'LINK/USDT': 0.56,
+    'TRX/USDT': 0.51
+}
+
+# 리스크 레벨 점수 (미확인은 medium 취급)
+_RISK_SCORES = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4, 'unknown': 2}
+
+_MAJOR_COINS = frozenset({'BTC/USDT', 'ETH/USDT'})
+
+
+@functools.lru_cache(maxsize=1024)
+def _pair_correlation(pair: frozenset) -> float:
+    """두 심볼 간 상관관계 추정 (pair: 순서 무관 심볼 쌍, 같은 심볼이면 원소 1개)"""
+    # 메이저 코인들 간의 대략적인 상관관계
+    major_count = len(pair & _MAJOR_COINS)
+    if major_count == len(pair):
+        return 0.8  # BTC-ETH 높은 상관관계
+    elif major_count:
+        return 0.6  # 메이저 코인과 알트코인
+    else:
+        return 0.4  # 알트코인들 간 중간 상관관계
+
 
 class RiskManager:
     """리스크 관리 클래스"""
     
+    # 시장 체제별 배수: 트렌드 증가, 횡보 감소, 변동성 대폭 감소, 중립 기본값
+    REGIME_MULTIPLIERS = (1.3, 0.8, 0.6, 1.0)
+    # 시장 체제별 Kelly 기대 (평균 수익, 평균 손실)
+    REGIME_WIN_LOSS = ((0.18, 0.09), (0.15, 0.08), (0.12, 0.12), (0.15, 0.08))
+    # 유동성별 조정: 높음 약간 증가, 보통 기본값, 낮음 감소
+    LIQUIDITY_ADJUSTMENTS = (1.1, 1.0, 0.7)
+    # 모니터링 임계값
+    LIQUIDITY_HIGH_VALUE = 10000.0      # 유동성 리스크 high ($)
+    LIQUIDITY_MEDIUM_VALUE = 5000.0     # 유동성 리스크 medium ($)
+    CORRELATION_HIGH = 0.8              # 상관관계 리스크 high
+    CORRELATION_MEDIUM = 0.6            # 상관관계 리스크 medium
+    CORRELATION_SCALAR_MAX = 3          # 이 개수 이하 포지션은 쌍별 스칼라 계산
+    EXPOSURE_CRITICAL = 0.8             # 포지션 노출도 critical
+    EXPOSURE_MEDIUM = 0.6               # 포지션 노출도 medium
+    ESTIMATED_BALANCE = 10000.0         # 노출도 계산용 가상 잔고 (실제로는 현재 잔고를 가져와야 함)
+    LOSS_CUT_PCT = -0.05                # 자동 축소 대상 손실률
+    TIGHT_STOP_PCT = 0.03               # 강화 스탑로스 거리
+    # 시장 체제 감지: 최소 가격 표본 수, 기준선 EMA 계수, 기준선 대비 돌파 배수
+    REGIME_MIN_SAMPLES = 8
+    REGIME_EMA_ALPHA = 0.1
+    REGIME_BREAKOUT = 1.5
+    # 기준선과 무관하게 체제로 판정하는 절대 임계값 (틱당 로그수익률 표준편차 / 로그가격 기울기)
+    # 기준선이 따라붙어도 지속되는 변동성/추세 체제를 놓치지 않기 위한 하한
+    REGIME_VOLATILITY_FLOOR = 0.02
+    REGIME_TREND_FLOOR = 0.002
+    # 기준선 대비 돌파 판정의 최소 임계값 (기준선이 0에 가까울 때 부동소수점 잡음으로 전환되지 않도록)
+    REGIME_VOLATILITY_NOISE = 1e-4
+    REGIME_TREND_NOISE = 1e-5
+    # 포지션 SoA 버퍼 속성 이름 (슬롯 인덱스 공유)
+    POSITION_BUFFERS = ('_active', '_flags', '_sizes', '_entry_prices', '_current_prices',
+                        '_stop_losses', '_take_profits', '_entry_times', '_unrealized_pnls')
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         
@@ -35,7 +155,44 @@ class RiskManager:
         self.peak_balance = 0.0
         self.current_drawdown = 0.0
         self.positions = {}
-        self.risk_alerts = []
+        self._rng = random.Random(config.get('random_seed'))  # 시뮬레이션용 난수 생성기
+        self.max_risk_alerts = config.get('max_risk_alerts', 1000)  # 미조회 알림 보관 한도
+        self.risk_alerts = deque(maxlen=self.max_risk_alerts)
+        
+        # 포지션 누적 집계 (add/remove/update 시점에만 갱신)
+        self._agg = {'short_value': 0.0, 'short_market_value': 0.0, 'total_value': 0.0, 'total_upnl': 0.0}
+        
+        # 포지션 SoA 버퍼 (max_positions 크기로 선할당, 부족하면 2배 확장)
+        self.max_positions = config.get('max_positions', 50)
+        self._init_position_buffers(self.max_positions)
+        
+        # 시장 체제 감지용 심볼별 최근 가격 이력과 변동성/추세 기준선
+        self.regime_window = config.get('regime_window', 64)
+        self._price_history = {}
+        self._regime_vol_ema = None
+        self._regime_slope_ema = None
+        # 가격 기록 횟수와 기준선이 마지막으로 반영한 기록 횟수 (새 가격이 있을 때만 기준선 갱신)
+        self._price_updates = 0
+        self._regime_baseline_updates = 0
+        
+        # 체제 히스테리시스: 최근 분류 결과 링버퍼의 최빈값이 바뀔 때만 체제 전환
+        # (버퍼 전체를 중립으로 채운 상태에서 시작해 첫 틱부터 히스테리시스 적용, 크기는 최소 1)
+        hysteresis = max(1, int(config.get('regime_hysteresis', 16)))
+        self._regime_history = np.full(hysteresis, REGIME_NEUTRAL, dtype=np.uint8)
+        self._regime_history_pos = 0
+        self._previous_regime = REGIME_NEUTRAL
+        
+        # 심볼 간 상관관계 행렬 (신규 심볼 등록 시에만 확장)
+        self._symbol_idx = {}
+        self._corr_matrix = np.empty((0, 0), dtype=np.float64)
+        for symbol in config.get('symbols', []):
+            self._symbol_index(symbol)
+        
+        # 리스크 레벨별 자동 대응 (없는 레벨은 대응 없음)
+        self._automatic_responses = {
+            'critical': self._respond_critical_risk,
+            'high': self._respond_high_risk
+        }
         
         logger.info("리스크 관리자 초기화 완료")
     
@@ -44,46 +201,41 @@ class RiskManager:
                       current_balance: float, exchange_type: str = 'spot') -> Dict[str, Any]:
         """거래 유효성 검증"""
         try:
-            validation_result = {
-                'is_valid': True,
-                'warnings': [],
-                'errors': [],
-                'adjusted_size': size
-            }
+            # 경고/오류 목록은 결과에 그대로 담고, 하위 검증은 목록에 직접 추가
+            warnings = []
+            errors = []
+            adjusted_size = size
             
             # 포지션 크기 검증
             position_value = size * price
             max_position_value = current_balance * self.max_position_size
             
             if position_value > max_position_value:
-                validation_result['warnings'].append(f"포지션 크기 초과: {position_value:.2f} > {max_position_value:.2f}")
-                validation_result['adjusted_size'] = max_position_value / price
+                warnings.append(f"포지션 크기 초과: {position_value:.2f} > {max_position_value:.2f}")
+                adjusted_size = max_position_value / price
             
             # 일일 손실 한도 검증
             if self.daily_pnl < -current_balance * self.max_daily_loss:
-                validation_result['is_valid'] = False
-                validation_result['errors'].append(f"일일 손실 한도 초과: {self.daily_pnl:.2f}")
+                errors.append(f"일일 손실 한도 초과: {self.daily_pnl:.2f}")
             
             # 드로우다운 검증
             if self.current_drawdown > self.max_drawdown:
-                validation_result['is_valid'] = False
-                validation_result['errors'].append(f"최대 드로우다운 초과: {self.current_drawdown:.2%}")
-            
-            # 공매도 특화 검증
-            if side == 'sell' and exchange_type == 'futures':
-                short_validation = self._validate_short_position(symbol, size, price, current_balance)
-                validation_result['warnings'].extend(short_validation['warnings'])
-                validation_result['errors'].extend(short_validation['errors'])
-                if not short_validation['is_valid']:
-                    validation_result['is_valid'] = False
-            
-            # 레버리지 검증
+                errors.append(f"최대 드로우다운 초과: {self.current_drawdown:.2%}")
+            
             if exchange_type == 'futures':
-                leverage_validation = self._validate_leverage(size, price, current_balance)
-                validation_result['warnings'].extend(leverage_validation['warnings'])
-                validation_result['errors'].extend(leverage_validation['errors'])
+                # 공매도 특화 검증
+                if side == 'sell':
+                    self._validate_short_position(symbol, size, price, current_balance, warnings, errors)
+                
+                # 레버리지 검증
+                self._validate_leverage(size, price, current_balance, warnings)
             
-            return validation_result
+            return {
+                'is_valid': not errors,
+                'warnings': warnings,
+                'errors': errors,
+                'adjusted_size': adjusted_size
+            }
         except Exception as e:
             logger.error(f"거래 검증 실패: {e}")
             return {
@@ -93,82 +245,46 @@ class RiskManager:
                 'adjusted_size': 0
             }
     
-    def _validate_short_position(self, symbol: str, size: float, price: float, 
-                               current_balance: float) -> Dict[str, Any]:
-        """공매도 포지션 검증"""
+    def _validate_short_position(self, symbol: str, size: float, price: float, current_balance: float,
+                                 warnings: List[str], errors: List[str]):
+        """공매도 포지션 검증 (경고/오류를 전달받은 목록에 추가)"""
         try:
-            validation_result = {
-                'is_valid': True,
-                'warnings': [],
-                'errors': []
-            }
-            
             # 공매도 포지션 한도 검증
-            current_short_value = sum(
-                pos['size'] * pos['price'] for pos in self.positions.values()
-                if pos['side'] == 'sell' and pos['exchange_type'] == 'futures'
-            )
+            current_short_value = self._agg['short_value']
             new_short_value = current_short_value + (size * price)
             max_short_value = current_balance * self.short_position_limit
             
             if new_short_value > max_short_value:
-                validation_result['is_valid'] = False
-                validation_result['errors'].append(
-                    f"공매도 포지션 한도 초과: {new_short_value:.2f} > {max_short_value:.2f}"
-                )
+                errors.append(f"공매도 포지션 한도 초과: {new_short_value:.2f} > {max_short_value:.2f}")
             
             # 숏 스퀴즈 위험 검증
             if symbol in self.positions:
                 recent_price_change = self._calculate_recent_price_change(symbol)
                 if recent_price_change > self.short_squeeze_threshold:
-                    validation_result['warnings'].append(
-                        f"숏 스퀴즈 위험: 최근 가격 상승 {recent_price_change:.2%}"
-                    )
-            
-            return validation_result
+                    warnings.append(f"숏 스퀴즈 위험: 최근 가격 상승 {recent_price_change:.2%}")
         except Exception as e:
             logger.error(f"공매도 포지션 검증 실패: {e}")
-            return {
-                'is_valid': False,
-                'warnings': [],
-                'errors': [f"공매도 검증 오류: {e}"]
-            }
+            errors.append(f"공매도 검증 오류: {e}")
     
-    def _validate_leverage(self, size: float, price: float, current_balance: float) -> Dict[str, Any]:
-        """레버리지 검증"""
+    def _validate_leverage(self, size: float, price: float, current_balance: float, warnings: List[str]):
+        """레버리지 검증 (경고를 전달받은 목록에 추가)"""
         try:
-            validation_result = {
-                'is_valid': True,
-                'warnings': [],
-                'errors': []
-            }
-            
             position_value = size * price
             required_margin = position_value / self.max_leverage
             
             if required_margin > current_balance * 0.8:  # 잔고의 80% 이상 사용
-                validation_result['warnings'].append(
-                    f"높은 레버리지 사용: 필요 마진 {required_margin:.2f}"
-                )
-            
-            return validation_result
+                warnings.append(f"높은 레버리지 사용: 필요 마진 {required_margin:.2f}")
         except Exception as e:
             logger.error(f"레버리지 검증 실패: {e}")
-            return {
-                'is_valid': True,
-                'warnings': [],
-                'errors': []
-            }
     
     def _calculate_recent_price_change(self, symbol: str) -> float:
         """최근 가격 변화 계산"""
         try:
-            if symbol in self.positions:
-                position = self.positions[symbol]
-                entry_price = position['price']
-                current_price = position.get('current_price', entry_price)
-                return (current_price - entry_price) / entry_price
-            return 0.0
+            position = self.positions.get(symbol)
+            if position is None:
+                return 0.0
+            entry_price = position.price
+            return (position.current_price - entry_price) / entry_price
         except Exception as e:
             logger.error(f"가격 변화 계산 실패: {e}")
             return 0.0
@@ -192,26 +308,27 @@ class RiskManager:
             logger.error(f"포지션 크기 계산 실패: {e}")
             return 0.0
 
-    @log_execution_time
     def adaptive_position_sizing(self, symbol: str, signal_strength: float, 
                                 current_balance: float, current_price: float,
                                 market_conditions: Dict[str, Any]) -> float:
         """시장 상황 적응형 포지션 크기 계산"""
         try:
+            regime_id, liquidity_id = self._resolve_market_codes(market_conditions)
+            
             # 1. 실시간 승률 계산
             recent_win_rate = self._calculate_recent_win_rate(symbol, days=30)
             
             # 2. 동적 Kelly Criterion 적용
-            dynamic_kelly = self._calculate_dynamic_kelly(symbol, recent_win_rate, market_conditions)
+            dynamic_kelly = self._calculate_dynamic_kelly(symbol, recent_win_rate, regime_id)
             
             # 3. 변동성 조정
             volatility_adj = self._calculate_volatility_adjustment(market_conditions['volatility'])
             
             # 4. 시장 체제별 조정
-            regime_multiplier = self._get_regime_multiplier(market_conditions['regime'])
+            regime_multiplier = self._get_regime_multiplier(regime_id)
             
             # 5. 유동성 조정
-            liquidity_adj = self._calculate_liquidity_adjustment(market_conditions['liquidity'])
+            liquidity_adj = self._calculate_liquidity_adjustment(liquidity_id)
             
             # 6. 상관관계 리스크 조정
             correlation_adj = self._calculate_correlation_adjustment(symbol)
@@ -233,31 +350,27 @@ class RiskManager:
             logger.error(f"적응형 포지션 사이징 실패: {e}")
             return self._fallback_position_size(current_balance, current_price)
 
+    def _resolve_market_codes(self, market_conditions: Dict[str, Any]) -> Tuple[int, int]:
+        """시장 조건의 체제/유동성 코드 조회 (코드가 없으면 문자열 변환)"""
+        regime_id = market_conditions.get('regime_id')
+        if regime_id is None:
+            regime_id = _REGIME_IDS.get(market_conditions.get('regime'), REGIME_NEUTRAL)
+        liquidity_id = market_conditions.get('liquidity_id')
+        if liquidity_id is None:
+            liquidity_id = _LIQUIDITY_IDS.get(market_conditions.get('liquidity'), LIQUIDITY_NORMAL)
+        return regime_id, liquidity_id
+
     def _calculate_recent_win_rate(self, symbol: str, days: int = 30) -> float:
         """최근 거래 승률 계산"""
         try:
             # 실제 구현에서는 데이터베이스에서 최근 거래 기록을 가져와야 함
             # 현재는 시뮬레이션된 값 사용
             
-            # 심볼별 기본 승률 (과거 데이터 기반 추정)
-            base_win_rates = {
-                'BTC/USDT': 0.58,
-                'ETH/USDT': 0.56,
-                'BNB/USDT': 0.54,
-                'XRP/USDT': 0.52,
-                'SOL/USDT': 0.55,
-                'ADA/USDT': 0.53,
-                'AVAX/USDT': 0.54,
-                'LINK/USDT': 0.56,
-                'TRX/USDT': 0.51
-            }
-            
-            base_rate = base_win_rates.get(symbol, 0.52)
+            base_rate = _BASE_WIN_RATES.get(symbol, 0.52)
             
             # 최근 시장 상황에 따른 조정 (실제로는 DB 쿼리 결과 사용)
             # 여기서는 간단한 변동을 시뮬레이션
-            import random
-            adjustment = random.uniform(-0.05, 0.05)  # ±5% 변동
+            adjustment = self._rng.uniform(-0.05, 0.05)  # ±5% 변동
             
             recent_rate = max(0.3, min(0.8, base_rate + adjustment))
             return recent_rate
@@ -266,20 +379,12 @@ class RiskManager:
             logger.error(f"승률 계산 실패: {e}")
             return 0.52  # 기본값
 
-    def _calculate_dynamic_kelly(self, symbol: str, win_rate: float, 
-                                market_conditions: Dict[str, Any]) -> float:
+    def _calculate_dynamic_kelly(self, symbol: str, win_rate: float, regime_id: int) -> float:
         """동적 Kelly Criterion 계산"""
         try:
-            # 시장 조건에 따른 수익/손실 비율 조정
-            if market_conditions['regime'] == 'trending':
-                avg_win = 0.18   # 트렌드 시장에서 더 큰 수익 기대
-                avg_loss = 0.09
-            elif market_conditions['regime'] == 'volatile':
-                avg_win = 0.12   # 변동성 시장에서 작은 수익
-                avg_loss = 0.12
-            else:  # ranging 또는 neutral
-                avg_win = 0.15
-                avg_loss = 0.08
+            # 시장 체제에 따른 수익/손실 비율 조정
+            # (트렌드: 더 큰 수익 기대, 변동성: 작은 수익, 횡보/중립: 기본)
+            avg_win, avg_loss = self.REGIME_WIN_LOSS[regime_id]
             
             # Kelly 공식: f = (bp - q) / b
             # f = fraction to bet, b = odds received, p = win probability, q = lose probability
@@ -314,37 +419,30 @@ class RiskManager:
             logger.error(f"변동성 조정 계산 실패: {e}")
             return 0.8
 
-    def _get_regime_multiplier(self, regime: str) -> float:
+    def _get_regime_multiplier(self, regime_id: int) -> float:
         """시장 체제별 배수"""
-        regime_multipliers = {
-            'trending': 1.3,    # 트렌드 시장: 포지션 크기 증가
-            'ranging': 0.8,     # 횡보 시장: 포지션 크기 감소
-            'volatile': 0.6,    # 변동성 시장: 포지션 크기 대폭 감소
-            'neutral': 1.0      # 중립: 기본값
-        }
-        return regime_multipliers.get(regime, 1.0)
+        return self.REGIME_MULTIPLIERS[regime_id]
 
-    def _calculate_liquidity_adjustment(self, liquidity: str) -> float:
+    def _calculate_liquidity_adjustment(self, liquidity_id: int) -> float:
         """유동성 조정"""
-        liquidity_adjustments = {
-            'high': 1.1,      # 높은 유동성: 약간 증가
-            'normal': 1.0,    # 보통 유동성: 기본값
-            'low': 0.7        # 낮은 유동성: 감소
-        }
-        return liquidity_adjustments.get(liquidity, 1.0)
+        return self.LIQUIDITY_ADJUSTMENTS[liquidity_id]
 
     def _calculate_correlation_adjustment(self, symbol: str) -> float:
         """포트폴리오 상관관계 조정"""
         try:
-            # 현재 포지션들과의 상관관계 계산
-            correlation_risk = 0.0
+            # 다른 보유 포지션이 없으면 상관관계 리스크 없음
+            position_count = len(self.positions)
+            if position_count == 0 or (position_count == 1 and symbol in self.positions):
+                return 1.0
             
-            for existing_symbol, position in self.positions.items():
-                if existing_symbol != symbol:
-                    # 심볼 간 상관관계 추정 (실제로는 과거 가격 데이터 기반 계산)
-                    correlation = self._estimate_correlation(symbol, existing_symbol)
-                    position_weight = abs(position['size'] * position['current_price'])
-                    correlation_risk += correlation * position_weight
+            # 현재 포지션들과의 상관관계 계산 (상관관계 행렬 행 · 포지션 가중치)
+            others = [(existing_symbol, position) for existing_symbol, position in self.positions.items()
+                      if existing_symbol != symbol]
+            row = self._symbol_index(symbol)
+            cols = [self._symbol_index(existing_symbol) for existing_symbol, _ in others]
+            weights = np.fromiter((abs(position.size * position.current_price) for _, position in others),
+                                  dtype=np.float64, count=len(others))
+            correlation_risk = float(np.dot(self._corr_matrix[row, cols], weights))
             
             # 상관관계 리스크가 높을수록 포지션 크기 감소
             if correlation_risk > 0.8:
@@ -360,22 +458,27 @@ class RiskManager:
             logger.error(f"상관관계 조정 계산 실패: {e}")
             return 0.9
 
+    def _symbol_index(self, symbol: str) -> int:
+        """상관관계 행렬 인덱스 조회 (처음 보는 심볼은 행렬에 추가)"""
+        idx = self._symbol_idx.get(symbol)
+        if idx is None:
+            idx = len(self._symbol_idx)
+            # 심볼 간 상관관계 추정 (실제로는 과거 가격 데이터 기반 계산)
+            correlations = np.array(
+                [self._estimate_correlation(symbol, existing) for existing in self._symbol_idx] + [1.0],
+                dtype=np.float64
+            )
+            matrix = np.empty((idx + 1, idx + 1), dtype=np.float64)
+            matrix[:idx, :idx] = self._corr_matrix
+            matrix[idx, :] = correlations
+            matrix[:, idx] = correlations
+            self._corr_matrix = matrix
+            self._symbol_idx[symbol] = idx
+        return idx
+
     def _estimate_correlation(self, symbol1: str, symbol2: str) -> float:
-        """두 심볼 간 상관관계 추정"""
-        try:
-            # 메이저 코인들 간의 대략적인 상관관계
-            major_coins = ['BTC/USDT', 'ETH/USDT']
-            
-            if symbol1 in major_coins and symbol2 in major_coins:
-                return 0.8  # BTC-ETH 높은 상관관계
-            elif symbol1 in major_coins or symbol2 in major_coins:
-                return 0.6  # 메이저 코인과 알트코인
-            else:
-                return 0.4  # 알트코인들 간 중간 상관관계
-                
-        except Exception as e:
-            logger.error(f"상관관계 추정 실패: {e}")
-            return 0.5
+        """두 심볼 간 상관관계 추정 (대칭이므로 순서 무관하게 캐시 공유)"""
+        return _pair_correlation(frozenset((symbol1, symbol2)))
 
     def _apply_safety_limits(self, calculated_size: float, current_balance: float, 
                            current_price: float) -> float:
@@ -414,7 +517,6 @@ class RiskManager:
             logger.error(f"폴백 포지션 크기 계산 실패: {e}")
             return 0.0
     
-    @log_execution_time
     def calculate_stop_loss(self, symbol: str, side: str, entry_price: float, 
                            volatility: float = 0.02) -> float:
         """스탑로스 가격 계산"""
@@ -443,7 +545,6 @@ class RiskManager:
             logger.error(f"스탑로스 계산 실패: {e}")
             return entry_price
     
-    @log_execution_time
     def calculate_take_profit(self, symbol: str, side: str, entry_price: float, 
                             signal_strength: float = 0.5) -> float:
         """테이크프로핏 가격 계산"""
@@ -473,59 +574,143 @@ class RiskManager:
             logger.error(f"테이크프로핏 계산 실패: {e}")
             return entry_price
     
-    @log_execution_time
     def update_position_risk(self, symbol: str, current_price: float, 
                            unrealized_pnl: float = 0.0):
         """포지션 리스크 업데이트"""
         try:
-            if symbol not in self.positions:
+            position = self.positions.get(symbol)
+            if position is None:
                 return
             
-            position = self.positions[symbol]
-            position['current_price'] = current_price
-            position['unrealized_pnl'] = unrealized_pnl
-            position['last_update'] = datetime.now()
-            
-            # 스탑로스 체크
-            if self._should_stop_loss(position, current_price):
-                self.risk_alerts.append({
-                    'type': 'stop_loss',
-                    'symbol': symbol,
-                    'message': f"스탑로스 발생: {symbol} 현재가 {current_price:.6f}",
-                    'timestamp': datetime.now()
-                })
+            now = datetime.now()
+            self._apply_position_aggregates(position, -1.0)
+            position.current_price = current_price
+            position.unrealized_pnl = unrealized_pnl
+            self._apply_position_aggregates(position, 1.0)
+            position.last_update = now
+            slot = position.slot
+            self._current_prices[slot] = current_price
+            self._unrealized_pnls[slot] = unrealized_pnl
+            self._record_price(symbol, current_price)
+            
+            self._append_exit_alerts(
+                symbol, current_price, now,
+                stop_loss=self._should_stop_loss(position, current_price),
+                take_profit=self._should_take_profit(position, current_price),
+                timeout=self._is_position_timeout(position, now.timestamp())
+            )
             
-            # 테이크프로핏 체크
-            if self._should_take_profit(position, current_price):
-                self.risk_alerts.append({
-                    'type': 'take_profit',
-                    'symbol': symbol,
-                    'message': f"테이크프로핏 발생: {symbol} 현재가 {current_price:.6f}",
-                    'timestamp': datetime.now()
-                })
+        except Exception as e:
+            logger.error(f"포지션 리스크 업데이트 실패: {e}")
+    
+    def update_positions_risk(self, price_map: Dict[str, float]):
+        """전체 포지션 리스크 일괄 업데이트 (심볼 → 현재가)"""
+        try:
+            symbols = []
+            positions = []
+            for symbol in price_map:
+                position = self.positions.get(symbol)
+                if position is not None:
+                    symbols.append(symbol)
+                    positions.append(position)
+            
+            count = len(positions)
+            if count == 0:
+                return
             
-            # 포지션 타임아웃 체크
-            if self._is_position_timeout(position):
-                self.risk_alerts.append({
-                    'type': 'timeout',
-                    'symbol': symbol,
-                    'message': f"포지션 타임아웃: {symbol} 보유시간 초과",
-                    'timestamp': datetime.now()
-                })
+            now = datetime.now()
+            slots = np.fromiter((pos.slot for pos in positions), dtype=np.intp, count=count)
+            current_prices = np.fromiter((price_map[symbol] for symbol in symbols), dtype=np.float64, count=count)
+            sides = np.where(self._flags[slots] & SELL_FLAG, -1.0, 1.0)
+            
+            # 미실현 손익 계산 및 포지션 반영
+            unrealized_pnls = sides * (current_prices - self._entry_prices[slots]) * self._sizes[slots]
+            self._current_prices[slots] = current_prices
+            self._unrealized_pnls[slots] = unrealized_pnls
+            for position, current_price, unrealized_pnl in zip(positions, current_prices.tolist(),
+                                                               unrealized_pnls.tolist()):
+                self._apply_position_aggregates(position, -1.0)
+                position.current_price = current_price
+                position.unrealized_pnl = unrealized_pnl
+                self._apply_position_aggregates(position, 1.0)
+                position.last_update = now
+            for symbol, current_price in zip(symbols, current_prices.tolist()):
+                self._record_price(symbol, current_price)
+            
+            # 스탑로스 / 테이크프로핏 / 타임아웃 일괄 판정
+            triggered, stop_loss_hit, take_profit_hit, timed_out = self._evaluate_exit_conditions(
+                sides, current_prices, self._stop_losses[slots], self._take_profits[slots],
+                self._entry_times[slots], now.timestamp()
+            )
+            
+            for i in triggered:
+                self._append_exit_alerts(
+                    symbols[i], float(current_prices[i]), now,
+                    stop_loss=bool(stop_loss_hit[i]),
+                    take_profit=bool(take_profit_hit[i]),
+                    timeout=bool(timed_out[i])
+                )
             
         except Exception as e:
-            logger.error(f"포지션 리스크 업데이트 실패: {e}")
+            logger.error(f"포지션 리스크 일괄 업데이트 실패: {e}")
+    
+    def _record_price(self, symbol: str, price: float):
+        """시장 체제 감지용 가격 이력 기록"""
+        if price <= 0:
+            return
+        history = self._price_history.get(symbol)
+        if history is None:
+            history = self._price_history[symbol] = deque(maxlen=self.regime_window)
+        history.append(price)
+        self._price_updates += 1
     
-    def _should_stop_loss(self, position: Dict[str, Any], current_price: float) -> bool:
+    def _evaluate_exit_conditions(self, sides: np.ndarray, current_prices: np.ndarray,
+                                  stop_losses: np.ndarray, take_profits: np.ndarray,
+                                  entry_times: np.ndarray, now_ts: float
+                                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray, np.ndarray]:
+        """스탑로스/테이크프로핏/타임아웃 동시 판정 (sides: 매수 +1, 매도 -1)"""
+        # 방향 부호를 곱해 매수/매도 비교를 하나의 식으로 처리 (가격 0은 미설정)
+        stop_loss_hit = (stop_losses != 0) & (sides * (current_prices - stop_losses) <= 0)
+        take_profit_hit = (take_profits != 0) & (sides * (current_prices - take_profits) >= 0)
+        timed_out = now_ts - entry_times > self.position_timeout_hours * 3600
+        triggered = np.flatnonzero(stop_loss_hit | take_profit_hit | timed_out)
+        return triggered, stop_loss_hit, take_profit_hit, timed_out
+    
+    def _append_exit_alerts(self, symbol: str, current_price: float, now: datetime,
+                            stop_loss: bool, take_profit: bool, timeout: bool):
+        """청산 조건 알림 추가"""
+        if stop_loss:
+            self.risk_alerts.append({
+                'type': 'stop_loss',
+                'symbol': symbol,
+                'message': f"스탑로스 발생: {symbol} 현재가 {current_price:.6f}",
+                'timestamp': now
+            })
+        
+        if take_profit:
+            self.risk_alerts.append({
+                'type': 'take_profit',
+                'symbol': symbol,
+                'message': f"테이크프로핏 발생: {symbol} 현재가 {current_price:.6f}",
+                'timestamp': now
+            })
+        
+        if timeout:
+            self.risk_alerts.append({
+                'type': 'timeout',
+                'symbol': symbol,
+                'message': f"포지션 타임아웃: {symbol} 보유시간 초과",
+                'timestamp': now
+            })
+    
+    def _should_stop_loss(self, position: RiskPosition, current_price: float) -> bool:
         """스탑로스 여부 확인"""
         try:
-            side = position['side']
-            stop_loss_price = position.get('stop_loss_price', 0)
-            
-            if stop_loss_price == 0:
+            stop_loss_price = position.stop_loss_price
+            if not stop_loss_price:
                 return False
             
-            if side == 'buy':
+            if position.side == 'buy':
                 return current_price <= stop_loss_price
             else:  # sell
                 return current_price >= stop_loss_price
@@ -533,16 +718,14 @@ class RiskManager:
             logger.error(f"스탑로스 확인 실패: {e}")
             return False
     
-    def _should_take_profit(self, position: Dict[str, Any], current_price: float) -> bool:
+    def _should_take_profit(self, position: RiskPosition, current_price: float) -> bool:
         """테이크프로핏 여부 확인"""
         try:
-            side = position['side']
-            take_profit_price = position.get('take_profit_price', 0)
-            
-            if take_profit_price == 0:
+            take_profit_price = position.take_profit_price
+            if not take_profit_price:
                 return False
             
-            if side == 'buy':
+            if position.side == 'buy':
                 return current_price >= take_profit_price
             else:  # sell
                 return current_price <= take_profit_price
@@ -550,12 +733,10 @@ class RiskManager:
             logger.error(f"테이크프로핏 확인 실패: {e}")
             return False
     
-    def _is_position_timeout(self, position: Dict[str, Any]) -> bool:
-        """포지션 타임아웃 확인"""
+    def _is_position_timeout(self, position: RiskPosition, now_ts: float) -> bool:
+        """포지션 타임아웃 확인 (entry_time: unix timestamp)"""
         try:
-            entry_time = position.get('entry_time', datetime.now())
-            timeout_threshold = timedelta(hours=self.position_timeout_hours)
-            return datetime.now() - entry_time > timeout_threshold
+            return now_ts - position.entry_time > self.position_timeout_hours * 3600
         except Exception as e:
             logger.error(f"포지션 타임아웃 확인 실패: {e}")
             return False
@@ -571,42 +752,123 @@ class RiskManager:
     def update_drawdown(self, current_balance: float):
         """드로우다운 업데이트"""
         try:
-            if current_balance > self.peak_balance:
-                self.peak_balance = current_balance
-                self.current_drawdown = 0.0
-            else:
-                self.current_drawdown = (self.peak_balance - current_balance) / self.peak_balance
+            self.peak_balance = max(self.peak_balance, current_balance)
+            self.current_drawdown = 1.0 - current_balance / self.peak_balance if self.peak_balance > 0 else 0.0
             
             logger.debug(f"드로우다운 업데이트: {self.current_drawdown:.2%}")
         except Exception as e:
             logger.error(f"드로우다운 업데이트 실패: {e}")
     
+    def update_drawdowns_batch(self, balances) -> np.ndarray:
+        """잔고 시계열 드로우다운 일괄 계산 (기존 최고 잔고에 이어서 누적)"""
+        try:
+            balances = np.asarray(balances, dtype=np.float64)
+            if balances.size == 0:
+                return balances
+            
+            peaks = np.maximum(np.maximum.accumulate(balances), self.peak_balance)
+            drawdowns = np.divide(peaks - balances, peaks, out=np.zeros_like(balances), where=peaks > 0)
+            
+            self.peak_balance = float(peaks[-1])
+            self.current_drawdown = float(drawdowns[-1])
+            logger.debug(f"드로우다운 일괄 업데이트: {balances.size}건, 현재 {self.current_drawdown:.2%}")
+            return drawdowns
+        except Exception as e:
+            logger.error(f"드로우다운 일괄 업데이트 실패: {e}")
+            return np.zeros(0, dtype=np.float64)
+    
     def add_position(self, symbol: str, side: str, size: float, price: float, 
                     exchange_type: str = 'spot', stop_loss_price: float = 0, 
                     take_profit_price: float = 0):
         """포지션 추가"""
         try:
-            self.positions[symbol] = {
-                'symbol': symbol,
-                'side': side,
-                'size': size,
-                'price': price,
-                'exchange_type': exchange_type,
-                'stop_loss_price': stop_loss_price,
-                'take_profit_price': take_profit_price,
-                'entry_time': datetime.now(),
-                'unrealized_pnl': 0.0,
-                'current_price': price
-            }
+            previous = self.positions.get(symbol)
+            if previous is not None:
+                self._apply_position_aggregates(previous, -1.0)
+                slot = previous.slot
+            else:
+                if not self._free_slots:
+                    self._grow_position_buffers()
+                slot = self._free_slots.pop()
+            
+            position = RiskPosition(
+                symbol=symbol,
+                side=side,
+                size=size,
+                price=price,
+                exchange_type=exchange_type,
+                flags=_position_flags(side, exchange_type),
+                stop_loss_price=float(stop_loss_price or 0.0),
+                take_profit_price=float(take_profit_price or 0.0),
+                entry_time=time.time(),
+                current_price=price,  # 진입 시점 현재가 = 진입가로 정규화
+                slot=slot
+            )
+            self.positions[symbol] = position
+            self._apply_position_aggregates(position, 1.0)
+            self._slot_symbols[slot] = symbol
+            self._active[slot] = True
+            self._active_cache = None
+            self._write_position_slot(position)
             logger.info(f"포지션 추가: {symbol} {side} {size} @ {price}")
         except Exception as e:
             logger.error(f"포지션 추가 실패: {e}")
     
+    def _init_position_buffers(self, capacity: int):
+        """포지션 SoA 버퍼 할당"""
+        self._slot_symbols = [None] * capacity
+        self._free_slots = list(range(capacity - 1, -1, -1))
+        self._active = np.zeros(capacity, dtype=np.bool_)
+        self._flags = np.zeros(capacity, dtype=np.uint8)
+        self._sizes = np.zeros(capacity, dtype=np.float64)
+        self._entry_prices = np.zeros(capacity, dtype=np.float64)
+        self._current_prices = np.zeros(capacity, dtype=np.float64)
+        self._stop_losses = np.zeros(capacity, dtype=np.float64)
+        self._take_profits = np.zeros(capacity, dtype=np.float64)
+        self._entry_times = np.zeros(capacity, dtype=np.float64)
+        self._unrealized_pnls = np.zeros(capacity, dtype=np.float64)
+        self._active_cache = None  # (활성 슬롯, 심볼 튜플) - 포지션 추가/제거 시 무효화
+    
+    def _grow_position_buffers(self):
+        """포지션 슬롯 부족 시 버퍼 2배 확장"""
+        capacity = self._active.size
+        new_capacity = max(capacity * 2, 1)
+        for name in self.POSITION_BUFFERS:
+            buffer = getattr(self, name)
+            grown = np.zeros(new_capacity, dtype=buffer.dtype)
+            grown[:capacity] = buffer
+            setattr(self, name, grown)
+        self._slot_symbols.extend([None] * (new_capacity - capacity))
+        self._free_slots.extend(range(new_capacity - 1, capacity - 1, -1))
+        logger.warning(f"포지션 버퍼 확장: {capacity} → {new_capacity}")
+    
+    def _write_position_slot(self, position: RiskPosition):
+        """포지션 딕셔너리 값을 SoA 버퍼 슬롯에 기록"""
+        slot = position.slot
+        self._flags[slot] = position.flags
+        self._sizes[slot] = position.size
+        self._entry_prices[slot] = position.price
+        self._current_prices[slot] = position.current_price
+        self._stop_losses[slot] = position.stop_loss_price
+        self._take_profits[slot] = position.take_profit_price
+        self._entry_times[slot] = position.entry_time
+        self._unrealized_pnls[slot] = position.unrealized_pnl
+    
     def remove_position(self, symbol: str):
         """포지션 제거"""
         try:
-            if symbol in self.positions:
-                del self.positions[symbol]
+            position = self.positions.pop(symbol, None)
+            if position is not None:
+                self._apply_position_aggregates(position, -1.0)
+                slot = position.slot
+                self._active[slot] = False
+                self._slot_symbols[slot] = None
+                self._free_slots.append(slot)
+                self._active_cache = None
+                if not self.positions:
+                    # 부동소수점 누적 오차 제거
+                    for key in self._agg:
+                        self._agg[key] = 0.0
                 logger.info(f"포지션 제거: {symbol}")
         except Exception as e:
             logger.error(f"포지션 제거 실패: {e}")
@@ -614,38 +876,38 @@ class RiskManager:
     def get_risk_alerts(self) -> List[Dict[str, Any]]:
         """리스크 알림 조회"""
         try:
-            alerts = self.risk_alerts.copy()
-            self.risk_alerts.clear()  # 조회 후 클리어
-            return alerts
+            # 조회 후 새 버퍼로 교체
+            alerts, self.risk_alerts = self.risk_alerts, deque(maxlen=self.max_risk_alerts)
+            return list(alerts)
         except Exception as e:
             logger.error(f"리스크 알림 조회 실패: {e}")
             return []
     
+    def _apply_position_aggregates(self, position: RiskPosition, sign: float):
+        """포지션 기여분을 누적 집계에 반영 (sign: +1 추가, -1 제거)"""
+        agg = self._agg
+        market_value = position.size * position.current_price
+        agg['total_value'] += sign * market_value
+        agg['total_upnl'] += sign * position.unrealized_pnl
+        if position.flags == SHORT_FUTURES_FLAGS:
+            agg['short_value'] += sign * position.size * position.price
+            agg['short_market_value'] += sign * market_value
+    
     def get_risk_summary(self) -> Dict[str, Any]:
         """리스크 요약 정보"""
         try:
-            total_position_value = sum(
-                pos['size'] * pos['current_price'] for pos in self.positions.values()
-            )
-            
-            total_unrealized_pnl = sum(
-                pos['unrealized_pnl'] for pos in self.positions.values()
-            )
-            
-            short_position_value = sum(
-                pos['size'] * pos['current_price'] for pos in self.positions.values()
-                if pos['side'] == 'sell' and pos['exchange_type'] == 'futures'
-            )
+            agg = self._agg
             
             return {
                 'daily_pnl': self.daily_pnl,
                 'current_drawdown': self.current_drawdown,
                 'peak_balance': self.peak_balance,
                 'total_positions': len(self.positions),
-                'total_position_value': total_position_value,
-                'total_unrealized_pnl': total_unrealized_pnl,
-                'short_position_value': short_position_value,
-                'risk_alerts_count': len(self.risk_alerts)
+                'total_position_value': agg['total_value'],
+                'total_unrealized_pnl': agg['total_upnl'],
+                'short_position_value': agg['short_market_value'],
+                'risk_alerts_count': len(self.risk_alerts),
+                'market_regime': _REGIME_NAMES[self._previous_regime]
             }
         except Exception as e:
             logger.error(f"리스크 요약 정보 조회 실패: {e}")
@@ -683,20 +945,32 @@ class RiskManager:
                 'recommendations': []
             }
             
-            # 1. 포지션별 실시간 손익 추적
-            position_risks = self._monitor_position_risks()
-            
-            # 2. 포트폴리오 상관관계 리스크 체크
-            correlation_risks = self._monitor_correlation_risks()
+            if self.positions:
+                # 활성 슬롯과 포지션 가치는 모니터링 1회당 한 번만 계산해 공유
+                position_values = self._active_position_values()
+                
+                # 1. 포지션별 실시간 손익 추적 (모니터링 1회당 시각 1회 조회)
+                position_risks = self._monitor_position_risks(time.time())
+                
+                # 2. 포트폴리오 상관관계 리스크 체크
+                correlation_risks = self._monitor_correlation_risks(position_values)
+            else:
+                # 보유 포지션이 없으면 포지션 기반 모니터는 항상 low
+                position_risks = {'risk_level': 'low', 'alerts': [], 'actions': []}
+                correlation_risks = {'risk_level': 'low', 'correlation': 0.0, 'actions': []}
             
             # 3. 시장 체제 변화 감지
             regime_changes = self._detect_regime_changes()
             
-            # 4. 유동성 리스크 모니터링
-            liquidity_risks = self._monitor_liquidity_risks()
-            
-            # 5. 레버리지 및 마진 리스크 체크
-            leverage_risks = self._monitor_leverage_risks()
+            if self.positions:
+                # 4. 유동성 리스크 모니터링
+                liquidity_risks = self._monitor_liquidity_risks(position_values)
+                
+                # 5. 레버리지 및 마진 리스크 체크
+                leverage_risks = self._monitor_leverage_risks(position_values)
+            else:
+                liquidity_risks = {'risk_level': 'low', 'alerts': [], 'actions': []}
+                leverage_risks = {'risk_level': 'low', 'exposure_ratio': 0.0, 'actions': []}
             
             # 6. 종합 리스크 레벨 결정
             overall_risk = self._calculate_overall_risk_level([
@@ -719,49 +993,48 @@ class RiskManager:
             logger.error(f"실시간 리스크 모니터링 실패: {e}")
             return {'risk_level': 'unknown', 'actions_taken': [], 'warnings': [str(e)]}
 
-    def _monitor_position_risks(self) -> Dict[str, Any]:
+    def _monitor_position_risks(self, now_ts: float) -> Dict[str, Any]:
         """포지션별 리스크 모니터링"""
         try:
             position_alerts = []
             actions_taken = []
             
-            for symbol, position in self.positions.items():
-                current_price = position.get('current_price', position['price'])
-                entry_price = position['price']
-                size = position['size']
-                side = position['side']
-                
-                # 미실현 손익 계산
-                if side == 'buy':
-                    unrealized_pnl_pct = (current_price - entry_price) / entry_price
-                else:
-                    unrealized_pnl_pct = (entry_price - current_price) / entry_price
-                
-                # 1. 동적 스탑로스 조정
-                if unrealized_pnl_pct > 0.05:  # 5% 수익시
-                    new_stop_loss = self._update_trailing_stop(position, profit_ratio=0.02)
-                    if new_stop_loss:
-                        actions_taken.append(f"{symbol}: 트레일링 스탑 업데이트 → {new_stop_loss:.6f}")
-                
-                # 2. 큰 손실 경고
-                if unrealized_pnl_pct < -0.08:  # 8% 손실시
+            slots, symbols = self._active_slots()
+            if slots.size == 0:
+                return {'risk_level': 'low', 'alerts': position_alerts, 'actions': actions_taken}
+            
+            # 미실현 손익률 / 보유 시간 일괄 계산 (활성 슬롯만)
+            sides = np.where(self._flags[slots] & SELL_FLAG, -1.0, 1.0)
+            entry_prices = self._entry_prices[slots]
+            pnl_pcts = sides * (self._current_prices[slots] - entry_prices) / entry_prices
+            holding_hours = (now_ts - self._entry_times[slots]) / 3600
+            
+            # 1. 동적 스탑로스 조정 (5% 수익시)
+            for i in np.flatnonzero(pnl_pcts > 0.05):
+                new_stop_loss = self._update_trailing_stop(self.positions[symbols[i]], profit_ratio=0.02)
+                if new_stop_loss:
+                    actions_taken.append(f"{symbols[i]}: 트레일링 스탑 업데이트 → {new_stop_loss:.6f}")
+            
+            # 2. 큰 손실 경고 (8% 손실시) / 3. 포지션 타임아웃 체크
+            large_loss = pnl_pcts < -0.08
+            timed_out = holding_hours > self.position_timeout_hours
+            for i in np.flatnonzero(large_loss | timed_out):
+                symbol = symbols[i]
+                if large_loss[i]:
+                    unrealized_pnl_pct = float(pnl_pcts[i])
                     position_alerts.append({
                         'symbol': symbol,
                         'type': 'large_loss',
                         'pnl_pct': unrealized_pnl_pct,
                         'message': f"{symbol} 큰 손실 발생: {unrealized_pnl_pct:.2%}"
                     })
-                
-                # 3. 포지션 타임아웃 체크
-                entry_time = position.get('entry_time', datetime.now())
-                holding_hours = (datetime.now() - entry_time).total_seconds() / 3600
-                
-                if holding_hours > self.position_timeout_hours:
+                if timed_out[i]:
+                    hours = float(holding_hours[i])
                     position_alerts.append({
                         'symbol': symbol,
                         'type': 'timeout',
-                        'holding_hours': holding_hours,
-                        'message': f"{symbol} 포지션 타임아웃: {holding_hours:.1f}시간 보유"
+                        'holding_hours': hours,
+                        'message': f"{symbol} 포지션 타임아웃: {hours:.1f}시간 보유"
                     })
             
             return {
@@ -774,37 +1047,45 @@ class RiskManager:
             logger.error(f"포지션 리스크 모니터링 실패: {e}")
             return {'risk_level': 'unknown', 'alerts': [], 'actions': []}
 
-    def _monitor_correlation_risks(self) -> Dict[str, Any]:
+    def _active_slots(self) -> Tuple[np.ndarray, Tuple[str, ...]]:
+        """활성 슬롯 인덱스와 심볼 튜플 (포지션 변경 시에만 재계산)"""
+        if self._active_cache is None:
+            slots = np.flatnonzero(self._active)
+            self._active_cache = (slots, tuple(self._slot_symbols[slot] for slot in slots.tolist()))
+        return self._active_cache
+
+    def _active_position_values(self) -> Tuple[np.ndarray, np.ndarray]:
+        """활성 슬롯 인덱스와 포지션 가치(|수량 × 현재가|)"""
+        slots = self._active_slots()[0]
+        return slots, np.abs(self._sizes[slots] * self._current_prices[slots])
+
+    def _monitor_correlation_risks(self, position_values: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                   ) -> Dict[str, Any]:
         """포트폴리오 상관관계 리스크 모니터링"""
         try:
             if len(self.positions) < 2:
                 return {'risk_level': 'low', 'correlation': 0.0, 'actions': []}
             
-            # 포지션들 간 상관관계 계산
-            total_correlation_risk = 0.0
-            position_count = 0
             actions_taken = []
             
-            symbols = list(self.positions.keys())
-            for i, symbol1 in enumerate(symbols):
-                for symbol2 in symbols[i+1:]:
-                    correlation = self._estimate_correlation(symbol1, symbol2)
-                    
-                    # 포지션 가중치 고려
-                    weight1 = abs(self.positions[symbol1]['size'] * self.positions[symbol1]['current_price'])
-                    weight2 = abs(self.positions[symbol2]['size'] * self.positions[symbol2]['current_price'])
-                    weighted_correlation = correlation * (weight1 + weight2)
-                    
-                    total_correlation_risk += weighted_correlation
-                    position_count += 1
+            # 포지션들 간 상관관계 계산 (상삼각 쌍별 상관관계 × 두 포지션 가중치 합)
+            slots, weights = position_values or self._active_position_values()
+            symbols = self._active_slots()[1]
+            realized = self._realized_correlations(symbols)
+            
+            if realized is None and len(symbols) <= self.CORRELATION_SCALAR_MAX:
+                # 소규모 포트폴리오: 행렬 인덱싱 비용보다 쌍별 스칼라 계산이 빠름
+                total_correlation_risk, position_count = self._correlation_risk_scalar(symbols, weights.tolist())
+            else:
+                total_correlation_risk, position_count = self._correlation_risk_vectorized(symbols, weights, realized)
             
             avg_correlation = total_correlation_risk / position_count if position_count > 0 else 0
             
             # 상관관계가 너무 높으면 포지션 축소
-            if avg_correlation > 0.8:
+            if avg_correlation > self.CORRELATION_HIGH:
                 actions_taken.append("높은 상관관계 감지 - 포지션 축소 권장")
                 return {'risk_level': 'high', 'correlation': avg_correlation, 'actions': actions_taken}
-            elif avg_correlation > 0.6:
+            elif avg_correlation > self.CORRELATION_MEDIUM:
                 return {'risk_level': 'medium', 'correlation': avg_correlation, 'actions': actions_taken}
             else:
                 return {'risk_level': 'low', 'correlation': avg_correlation, 'actions': actions_taken}
@@ -813,61 +1094,150 @@ class RiskManager:
             logger.error(f"상관관계 리스크 모니터링 실패: {e}")
             return {'risk_level': 'unknown', 'correlation': 0.0, 'actions': []}
 
+    def _correlation_risk_scalar(self, symbols: Tuple[str, ...], weights: List[float]) -> Tuple[float, int]:
+        """쌍별 추정 상관관계 × 가중치 합 (스칼라 루프)"""
+        total_correlation_risk = 0.0
+        position_count = 0
+        for i in range(len(symbols)):
+            for j in range(i + 1, len(symbols)):
+                correlation = self._estimate_correlation(symbols[i], symbols[j])
+                total_correlation_risk += correlation * (weights[i] + weights[j])
+                position_count += 1
+        return total_correlation_risk, position_count
+
+    def _correlation_risk_vectorized(self, symbols: Tuple[str, ...], weights: np.ndarray,
+                                     realized: Optional[np.ndarray]) -> Tuple[float, int]:
+        """상삼각 쌍별 상관관계 × 가중치 합 (행렬 연산)"""
+        matrix_idx = [self._symbol_index(symbol) for symbol in symbols]
+        correlations = self._corr_matrix[np.ix_(matrix_idx, matrix_idx)]
+        
+        # 가격 이력이 충분하면 실현 상관관계 사용 (계산 불가 항목은 추정치 유지)
+        if realized is not None:
+            correlations = np.where(np.isfinite(realized), realized, correlations)
+        
+        rows, cols = np.triu_indices(len(matrix_idx), 1)
+        total_correlation_risk = float(np.dot(correlations[rows, cols], weights[rows] + weights[cols]))
+        return total_correlation_risk, int(rows.size)
+
+    def _realized_correlations(self, symbols: Tuple[str, ...]) -> Optional[np.ndarray]:
+        """최근 가격 이력의 로그수익률 상관관계 행렬 (이력이 부족하면 None)"""
+        histories = [self._price_history.get(symbol) for symbol in symbols]
+        if any(history is None for history in histories):
+            return None
+        
+        # 모든 심볼에 공통으로 있는 최근 구간만 사용
+        window = min(len(history) for history in histories)
+        if window < self.REGIME_MIN_SAMPLES:
+            return None
+        
+        prices = np.empty((window, len(histories)), dtype=np.float64)
+        for col, history in enumerate(histories):
+            prices[:, col] = list(history)[-window:]
+        log_returns = np.diff(np.log(prices), axis=0)
+        
+        # 가격 변화가 없는 심볼은 NaN (호출 측에서 추정치로 대체)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            return np.corrcoef(log_returns, rowvar=False)
+
     def _detect_regime_changes(self) -> Dict[str, Any]:
         """시장 체제 변화 감지"""
         try:
-            # 실제 구현시에는 최근 가격 데이터를 기반으로 체제 변화를 감지
-            # 현재는 시뮬레이션
-            
-            import random
-            regimes = ['trending', 'ranging', 'volatile', 'neutral']
-            current_regime = random.choice(regimes)
+            current_regime = self._smooth_regime(self._classify_regime())
             
-            # 이전 체제와 비교 (실제로는 저장된 값과 비교)
-            previous_regime = getattr(self, '_previous_regime', 'neutral')
+            # 이전 체제와 비교
+            previous_regime = self._previous_regime
             
             actions_taken = []
             if current_regime != previous_regime:
-                actions_taken.append(f"시장 체제 변화 감지: {previous_regime} → {current_regime}")
+                actions_taken.append(
+                    f"시장 체제 변화 감지: {_REGIME_NAMES[previous_regime]} → {_REGIME_NAMES[current_regime]}")
                 self._previous_regime = current_regime
                 
                 # 체제 변화에 따른 리스크 레벨 조정
-                if current_regime == 'volatile':
-                    return {'risk_level': 'high', 'regime': current_regime, 'actions': actions_taken}
-                elif current_regime == 'ranging':
-                    return {'risk_level': 'medium', 'regime': current_regime, 'actions': actions_taken}
+                if current_regime == REGIME_VOLATILE:
+                    return {'risk_level': 'high', 'regime': 'volatile', 'actions': actions_taken}
+                elif current_regime == REGIME_RANGING:
+                    return {'risk_level': 'medium', 'regime': 'ranging', 'actions': actions_taken}
             
-            return {'risk_level': 'low', 'regime': current_regime, 'actions': actions_taken}
+            return {'risk_level': 'low', 'regime': _REGIME_NAMES[current_regime], 'actions': actions_taken}
             
         except Exception as e:
             logger.error(f"체제 변화 감지 실패: {e}")
             return {'risk_level': 'unknown', 'regime': 'neutral', 'actions': []}
 
-    def _monitor_liquidity_risks(self) -> Dict[str, Any]:
+    def _smooth_regime(self, regime: int) -> int:
+        """최근 분류 결과 최빈값이 현재 체제보다 많을 때만 전환 (단일 틱 흔들림 억제)"""
+        history = self._regime_history
+        history[self._regime_history_pos] = regime
+        self._regime_history_pos = (self._regime_history_pos + 1) % history.size
+        
+        counts = np.bincount(history, minlength=len(_REGIME_NAMES))
+        candidate = int(counts.argmax())
+        return candidate if counts[candidate] > counts[self._previous_regime] else self._previous_regime
+
+    def _classify_regime(self) -> int:
+        """최근 가격 이력 기반 시장 체제 분류 (로그수익률 변동성 / 추세 기울기)"""
+        volatilities = []
+        slopes = []
+        for history in self._price_history.values():
+            count = len(history)
+            if count < self.REGIME_MIN_SAMPLES:
+                continue
+            log_prices = np.log(np.fromiter(history, dtype=np.float64, count=count))
+            volatilities.append(np.diff(log_prices).std())
+            slopes.append(abs(np.polyfit(np.arange(count), log_prices, 1)[0]))
+        
+        if not volatilities:
+            return REGIME_NEUTRAL  # 가격 이력 부족
+        
+        volatility = float(np.mean(volatilities))
+        slope = float(np.mean(slopes))
+        if self._regime_vol_ema is None:
+            self._regime_vol_ema = volatility
+            self._regime_slope_ema = slope
+        
+        # 기준선(EMA) 대비 돌파 또는 절대 임계값 이상: 변동성 → volatile, 추세 → trending, 그 외 → ranging
+        volatility_threshold = min(max(self._regime_vol_ema * self.REGIME_BREAKOUT, self.REGIME_VOLATILITY_NOISE),
+                                   self.REGIME_VOLATILITY_FLOOR)
+        slope_threshold = min(max(self._regime_slope_ema * self.REGIME_BREAKOUT, self.REGIME_TREND_NOISE),
+                              self.REGIME_TREND_FLOOR)
+        if volatility > volatility_threshold:
+            regime = REGIME_VOLATILE
+        elif slope > slope_threshold:
+            regime = REGIME_TRENDING
+        else:
+            regime = REGIME_RANGING
+        
+        # 기준선은 새 가격이 기록됐을 때만 갱신 (모니터링 호출 빈도와 무관하게 유지)
+        if self._price_updates != self._regime_baseline_updates:
+            self._regime_baseline_updates = self._price_updates
+            alpha = self.REGIME_EMA_ALPHA
+            self._regime_vol_ema += alpha * (volatility - self._regime_vol_ema)
+            self._regime_slope_ema += alpha * (slope - self._regime_slope_ema)
+        return regime
+
+    def _monitor_liquidity_risks(self, position_values: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                 ) -> Dict[str, Any]:
         """유동성 리스크 모니터링"""
         try:
             liquidity_alerts = []
             
-            for symbol, position in self.positions.items():
-                # 간단한 유동성 체크 (실제로는 주문장 깊이 분석 필요)
-                position_size = abs(position['size'] * position['current_price'])
-                
-                # 대형 포지션은 유동성 리스크가 높음
-                if position_size > 10000:  # $10,000 이상
-                    liquidity_alerts.append({
-                        'symbol': symbol,
-                        'position_size': position_size,
-                        'risk': 'high_impact'
-                    })
-                elif position_size > 5000:  # $5,000 이상
-                    liquidity_alerts.append({
-                        'symbol': symbol,
-                        'position_size': position_size,
-                        'risk': 'medium_impact'
-                    })
+            # 간단한 유동성 체크 (실제로는 주문장 깊이 분석 필요)
+            slots, position_sizes = position_values or self._active_position_values()
             
-            if len(liquidity_alerts) > 0:
-                risk_level = 'high' if any(alert['risk'] == 'high_impact' for alert in liquidity_alerts) else 'medium'
+            # 대형 포지션은 유동성 리스크가 높음
+            high_impact = position_sizes > self.LIQUIDITY_HIGH_VALUE
+            for i in np.flatnonzero(position_sizes > self.LIQUIDITY_MEDIUM_VALUE):
+                liquidity_alerts.append({
+                    'symbol': self._slot_symbols[slots[i]],
+                    'position_size': float(position_sizes[i]),
+                    'risk': 'high_impact' if high_impact[i] else 'medium_impact'
+                })
+            
+            if high_impact.any():
+                risk_level = 'high'
+            elif liquidity_alerts:
+                risk_level = 'medium'
             else:
                 risk_level = 'low'
             
@@ -877,29 +1247,23 @@ class RiskManager:
             logger.error(f"유동성 리스크 모니터링 실패: {e}")
             return {'risk_level': 'unknown', 'alerts': [], 'actions': []}
 
-    def _monitor_leverage_risks(self) -> Dict[str, Any]:
+    def _monitor_leverage_risks(self, position_values: Optional[Tuple[np.ndarray, np.ndarray]] = None
+                                ) -> Dict[str, Any]:
         """레버리지 및 마진 리스크 모니터링"""
         try:
-            total_position_value = 0
-            futures_position_value = 0
-            
-            for position in self.positions.values():
-                position_value = abs(position['size'] * position['current_price'])
-                total_position_value += position_value
-                
-                if position.get('exchange_type') == 'futures':
-                    futures_position_value += position_value
+            # 활성 슬롯의 포지션 가치
+            _, position_values = position_values or self._active_position_values()
+            total_position_value = float(position_values.sum())
             
             # 전체 잔고 대비 포지션 비중 (가상의 잔고 사용)
-            estimated_balance = 10000  # 실제로는 현재 잔고를 가져와야 함
-            total_exposure_ratio = total_position_value / estimated_balance
+            total_exposure_ratio = total_position_value / self.ESTIMATED_BALANCE
             
             actions_taken = []
             
-            if total_exposure_ratio > 0.8:  # 80% 이상 노출
+            if total_exposure_ratio > self.EXPOSURE_CRITICAL:
                 actions_taken.append("높은 포지션 노출도 감지 - 레버리지 축소 필요")
                 return {'risk_level': 'critical', 'exposure_ratio': total_exposure_ratio, 'actions': actions_taken}
-            elif total_exposure_ratio > 0.6:  # 60% 이상 노출
+            elif total_exposure_ratio > self.EXPOSURE_MEDIUM:
                 actions_taken.append("중간 수준 포지션 노출도")
                 return {'risk_level': 'medium', 'exposure_ratio': total_exposure_ratio, 'actions': actions_taken}
             else:
@@ -912,8 +1276,6 @@ class RiskManager:
     def _calculate_overall_risk_level(self, risk_components: List[Dict[str, Any]]) -> Dict[str, Any]:
         """종합 리스크 레벨 계산"""
         try:
-            risk_scores = {'low': 1, 'medium': 2, 'high': 3, 'critical': 4, 'unknown': 2}
-            
             total_score = 0
             valid_components = 0
             all_actions = []
@@ -921,15 +1283,14 @@ class RiskManager:
             recommendations = []
             
             for component in risk_components:
-                if 'risk_level' in component:
-                    total_score += risk_scores.get(component['risk_level'], 2)
+                level = component.get('risk_level')
+                if level is not None:
+                    total_score += _RISK_SCORES.get(level, 2)
                     valid_components += 1
                 
-                if 'actions' in component:
-                    all_actions.extend(component['actions'])
-                
-                if 'alerts' in component:
-                    all_warnings.extend([alert.get('message', str(alert)) for alert in component['alerts']])
+                all_actions.extend(component.get('actions', ()))
+                all_warnings.extend(alert['message'] if 'message' in alert else str(alert)
+                                    for alert in component.get('alerts', ()))
             
             if valid_components == 0:
                 return {'level': 'unknown', 'actions': [], 'warnings': [], 'recommendations': []}
@@ -973,43 +1334,46 @@ class RiskManager:
     def _execute_automatic_responses(self, risk_assessment: Dict[str, Any]):
         """자동 대응 실행"""
         try:
-            risk_level = risk_assessment['level']
-            
-            if risk_level == 'critical':
-                # 위험 포지션 자동 축소
-                self._reduce_risky_positions(reduction_ratio=0.5)
-                logger.critical("위험 수준 최고 - 포지션 50% 자동 축소 실행")
-                
-            elif risk_level == 'high':
-                # 스탑로스 강화
-                self._tighten_stop_losses()
-                logger.warning("위험 수준 높음 - 스탑로스 강화 실행")
-                
+            response = self._automatic_responses.get(risk_assessment['level'])
+            if response is not None:
+                response()
         except Exception as e:
             logger.error(f"자동 대응 실행 실패: {e}")
 
-    def _update_trailing_stop(self, position: Dict[str, Any], profit_ratio: float = 0.02) -> Optional[float]:
+    def _respond_critical_risk(self):
+        """위험 수준 최고 대응: 위험 포지션 자동 축소"""
+        self._reduce_risky_positions(reduction_ratio=0.5)
+        logger.critical("위험 수준 최고 - 포지션 50% 자동 축소 실행")
+
+    def _respond_high_risk(self):
+        """위험 수준 높음 대응: 스탑로스 강화"""
+        self._tighten_stop_losses()
+        logger.warning("위험 수준 높음 - 스탑로스 강화 실행")
+
+    def _update_trailing_stop(self, position: RiskPosition, profit_ratio: float = 0.02) -> Optional[float]:
         """트레일링 스탑 업데이트"""
         try:
-            current_price = position.get('current_price', position['price'])
-            side = position['side']
+            current_price = position.current_price
+            side = position.side
             
             # 트레일링 스탑 계산
             if side == 'buy':
                 new_stop_loss = current_price * (1 - profit_ratio)
-                current_stop_loss = position.get('stop_loss_price', 0)
+                current_stop_loss = position.stop_loss_price
                 
                 # 기존 스탑로스보다 높을 때만 업데이트
                 if new_stop_loss > current_stop_loss:
-                    position['stop_loss_price'] = new_stop_loss
+                    position.stop_loss_price = new_stop_loss
+                    self._stop_losses[position.slot] = new_stop_loss
                     return new_stop_loss
             else:  # sell
                 new_stop_loss = current_price * (1 + profit_ratio)
-                current_stop_loss = position.get('stop_loss_price', float('inf'))
+                current_stop_loss = position.stop_loss_price
                 
-                # 기존 스탑로스보다 낮을 때만 업데이트
-                if new_stop_loss < current_stop_loss:
-                    position['stop_loss_price'] = new_stop_loss
+                # 기존 스탑로스보다 낮을 때만 업데이트 (0은 미설정으로 간주)
+                if not current_stop_loss or new_stop_loss < current_stop_loss:
+                    position.stop_loss_price = new_stop_loss
+                    self._stop_losses[position.slot] = new_stop_loss
                     return new_stop_loss
             
             return None
@@ -1021,23 +1385,32 @@ class RiskManager:
     def _reduce_risky_positions(self, reduction_ratio: float = 0.3):
         """위험 포지션 축소"""
         try:
-            for symbol, position in self.positions.items():
-                current_price = position.get('current_price', position['price'])
-                entry_price = position['price']
-                side = position['side']
-                
-                # 손실 포지션 우선 축소
-                if side == 'buy':
-                    pnl_pct = (current_price - entry_price) / entry_price
-                else:
-                    pnl_pct = (entry_price - current_price) / entry_price
+            slots = self._active_slots()[0]
+            sides = np.where(self._flags[slots] & SELL_FLAG, -1.0, 1.0)
+            entry_prices = self._entry_prices[slots]
+            pnl_pcts = sides * (self._current_prices[slots] - entry_prices) / entry_prices
+            
+            # 손실 포지션 우선 축소
+            losing_slots = slots[pnl_pcts < self.LOSS_CUT_PCT]
+            original_sizes = self._sizes[losing_slots]
+            new_sizes = original_sizes * (1 - reduction_ratio)
+            self._sizes[losing_slots] = new_sizes
+            
+            # 로그 메시지는 INFO 활성 시에만 만들어 한 번에 출력
+            messages = [] if logger.logger.isEnabledFor(logging.INFO) else None
+            for slot, original_size, new_size in zip(losing_slots.tolist(), original_sizes.tolist(),
+                                                     new_sizes.tolist()):
+                symbol = self._slot_symbols[slot]
+                position = self.positions[symbol]
+                self._apply_position_aggregates(position, -1.0)
+                position.size = new_size
+                self._apply_position_aggregates(position, 1.0)
                 
-                if pnl_pct < -0.05:  # 5% 이상 손실 포지션
-                    original_size = position['size']
-                    new_size = original_size * (1 - reduction_ratio)
-                    position['size'] = new_size
-                    
-                    logger.info(f"포지션 자동 축소: {symbol} {original_size:.6f} → {new_size:.6f}")
+                if messages is not None:
+                    messages.append(f"{symbol} {original_size:.6f} → {new_size:.6f}")
+            
+            if messages:
+                logger.info("포지션 자동 축소: " + ", ".join(messages))
                     
         except Exception as e:
             logger.error(f"위험 포지션 축소 실패: {e}")
@@ -1045,18 +1418,24 @@ class RiskManager:
     def _tighten_stop_losses(self):
         """스탑로스 강화"""
         try:
-            for symbol, position in self.positions.items():
-                current_price = position.get('current_price', position['price'])
-                side = position['side']
-                
-                # 더 엄격한 스탑로스 설정
-                if side == 'buy':
-                    new_stop_loss = current_price * 0.97  # 3% 스탑로스
-                else:
-                    new_stop_loss = current_price * 1.03  # 3% 스탑로스
-                
-                position['stop_loss_price'] = new_stop_loss
-                logger.info(f"스탑로스 강화: {symbol} → {new_stop_loss:.6f}")
+            slots = self._active_slots()[0]
+            current_prices = self._current_prices[slots]
+            
+            # 더 엄격한 스탑로스 설정 (매수 아래, 매도 위로 TIGHT_STOP_PCT) - 배수 배열에 제자리 곱셈
+            new_stop_losses = np.where(self._flags[slots] & SELL_FLAG,
+                                       1.0 + self.TIGHT_STOP_PCT, 1.0 - self.TIGHT_STOP_PCT)
+            np.multiply(current_prices, new_stop_losses, out=new_stop_losses)
+            self._stop_losses[slots] = new_stop_losses
+            
+            messages = [] if logger.logger.isEnabledFor(logging.INFO) else None
+            for slot, new_stop_loss in zip(slots.tolist(), new_stop_losses.tolist()):
+                symbol = self._slot_symbols[slot]
+                self.positions[symbol].stop_loss_price = new_stop_loss
+                if messages is not None:
+                    messages.append(f"{symbol} → {new_stop_loss:.6f}")
+            
+            if messages:
+                logger.info("스탑로스 강화: " + ", ".join(messages))
                 
         except Exception as e:
             logger.error(f"스탑로스 강화 실패: {e}")
\ No newline at end of file
@@ -1,17 +1,27 @@
 """
 기술적 분석 모듈
 """
+from collections import OrderedDict, deque
 import pandas as pd
 import numpy as np
-import ta
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 from utils.logger import logger
-from utils.decorators import cache_result, log_execution_time
+from utils.decorators import log_execution_time
+
+try:
+    import talib
+except ImportError:  # TA-Lib 미설치 시 pandas/NumPy 구현 사용
+    talib = None
 
 
 class TechnicalAnalyzer:
     """기술적 분석 클래스"""
     
+    PRICE_COLUMNS = ('open', 'high', 'low', 'close')
+    INDICATOR_CACHE_SIZE = 64
+    MA_WINDOWS = (5, 10, 20, 50)
+    SIGNAL_KEYS = ('rsi_signal', 'macd_signal', 'bb_signal', 'stoch_signal')
+    
     def __init__(self, config: Dict[str, Any]):
         self.config = config
         self.rsi_period = config.get('rsi_period', 14)
@@ -22,74 +32,105 @@ class TechnicalAnalyzer:
         self.macd_signal = config.get('macd_signal', 9)
         self.bb_period = config.get('bb_period', 20)
         self.bb_stddev = config.get('bb_stddev', 2)
+        
+        # 평활 계수 (EMA K = 2/(N+1), Wilder alpha = 1/N)
+        self._k_fast = 2.0 / (self.macd_fast + 1)
+        self._k_slow = 2.0 / (self.macd_slow + 1)
+        self._k_signal = 2.0 / (self.macd_signal + 1)
+        self._rsi_alpha = 1.0 / self.rsi_period
+        
+        # 지표 결과 캐시 (봉 수 + 첫/마지막 봉 키, 새 봉이나 진행 중 봉 갱신 시 재계산)
+        self._indicator_cache = OrderedDict()
+        
+        # 스트리밍(마지막 봉 증분 갱신) 상태 - init_stream으로 초기화
+        self._state = {}
+    
+    @staticmethod
+    def _constant_series(like: pd.Series, value: float) -> pd.Series:
+        """입력과 같은 길이/인덱스의 상수 시리즈 (지표 계산 불가 시 기본값)"""
+        return pd.Series(np.full(len(like), value, dtype=np.float32), index=getattr(like, 'index', None))
     
-    @log_execution_time
     def calculate_rsi(self, prices: pd.Series) -> pd.Series:
         """RSI 계산"""
         try:
             if len(prices) < self.rsi_period + 10:
                 logger.warning(f"RSI 계산용 데이터 부족: {len(prices)} < {self.rsi_period + 10}")
-                return pd.Series([50] * len(prices))
+                return self._constant_series(prices, 50.0)
             
-            # RSI 계산
-            rsi_values = ta.momentum.RSIIndicator(close=prices, window=self.rsi_period).rsi()
+            close = prices.to_numpy(dtype=np.float64)
+            if talib is not None:
+                rsi_values = talib.RSI(close, timeperiod=self.rsi_period)
+            else:
+                # Wilder 평활 RSI (상승/하락폭을 한 번의 ewm 호출로 평활)
+                delta = np.diff(close, prepend=np.nan)
+                moves = pd.DataFrame({'gain': np.where(delta > 0, delta, 0.0),
+                                      'loss': np.where(delta < 0, -delta, 0.0)})
+                averages = moves.ewm(alpha=self._rsi_alpha, min_periods=self.rsi_period,
+                                     adjust=False).mean().to_numpy()
+                avg_gain, avg_loss = averages[:, 0], averages[:, 1]
+                
+                with np.errstate(divide='ignore', invalid='ignore'):
+                    rsi_values = np.where(avg_loss == 0, 100.0, 100.0 - 100.0 / (1.0 + avg_gain / avg_loss))
             
             # NaN 값 처리
-            rsi_series = rsi_values.fillna(50)
-            
-            return rsi_series
+            return pd.Series(np.nan_to_num(rsi_values, nan=50.0), index=prices.index)
         except Exception as e:
             logger.error(f"RSI 계산 오류: {e}")
-            return pd.Series([50] * len(prices))
+            return self._constant_series(prices, 50.0)
     
-    @log_execution_time 
     def calculate_macd(self, prices: pd.Series) -> Dict[str, pd.Series]:
         """MACD 계산"""
         try:
             min_length = max(self.macd_slow, self.macd_signal) + 20
             if len(prices) < min_length:
                 logger.warning(f"MACD 계산용 데이터 부족: {len(prices)} < {min_length}")
-                return {
-                    'macd': pd.Series([0] * len(prices)),
-                    'signal': pd.Series([0] * len(prices)),
-                    'histogram': pd.Series([0] * len(prices))
-                }
-            
-            # MACD 계산
-            macd_indicator = ta.trend.MACD(
-                close=prices,
-                window_fast=self.macd_fast,
-                window_slow=self.macd_slow,
-                window_sign=self.macd_signal
-            )
+                zeros = self._constant_series(prices, 0.0)
+                return {'macd': zeros, 'signal': zeros, 'histogram': zeros}
+            
+            if talib is not None:
+                macd, signal, histogram = (
+                    pd.Series(values, index=prices.index)
+                    for values in talib.MACD(prices.to_numpy(dtype=np.float64), fastperiod=self.macd_fast,
+                                             slowperiod=self.macd_slow, signalperiod=self.macd_signal)
+                )
+            else:
+                # MACD 계산 (pandas ewm 커널 직접 사용)
+                ema_fast = prices.ewm(span=self.macd_fast, min_periods=self.macd_fast, adjust=False).mean()
+                ema_slow = prices.ewm(span=self.macd_slow, min_periods=self.macd_slow, adjust=False).mean()
+                macd = ema_fast - ema_slow
+                signal = macd.ewm(span=self.macd_signal, min_periods=self.macd_signal, adjust=False).mean()
+                histogram = macd - signal
             
             # NaN 값 처리
             return {
-                'macd': macd_indicator.macd().fillna(0),
-                'signal': macd_indicator.macd_signal().fillna(0),
-                'histogram': macd_indicator.macd_diff().fillna(0)
+                'macd': macd.fillna(0),
+                'signal': signal.fillna(0),
+                'histogram': histogram.fillna(0)
             }
         except Exception as e:
             logger.error(f"MACD 계산 오류: {e}")
-            return {
-                'macd': pd.Series([0] * len(prices)),
-                'signal': pd.Series([0] * len(prices)),
-                'histogram': pd.Series([0] * len(prices))
-            }
+            zeros = self._constant_series(prices, 0.0)
+            return {'macd': zeros, 'signal': zeros, 'histogram': zeros}
     
-    @log_execution_time
     def calculate_bollinger_bands(self, prices: pd.Series) -> Dict[str, pd.Series]:
         """볼린저 밴드 계산"""
         try:
-            bb_indicator = ta.volatility.BollingerBands(
-                close=prices,
-                window=self.bb_period,
-                window_dev=self.bb_stddev
-            )
+            if talib is not None:
+                upper, middle, lower = (
+                    pd.Series(values, index=prices.index)
+                    for values in talib.BBANDS(prices.to_numpy(dtype=np.float64), timeperiod=self.bb_period,
+                                               nbdevup=self.bb_stddev, nbdevdn=self.bb_stddev)
+                )
+                return {'upper': upper, 'middle': middle, 'lower': lower}
+            
+            # 이동평균/표준편차를 한 번씩만 계산해 상하단 밴드 공유
+            window = prices.rolling(self.bb_period)
+            middle = window.mean()
+            band_width = window.std(ddof=0) * self.bb_stddev
             return {
-                'upper': bb_indicator.bollinger_hband(),
-                'middle': bb_indicator.bollinger_mavg(),
-                'lower': bb_indicator.bollinger_lband()
+                'upper': middle + band_width,
+                'middle': middle,
+                'lower': middle - band_width
             }
         except Exception as e:
             logger.error(f"볼린저 밴드 계산 오류: {e}")
@@ -99,117 +140,344 @@ class TechnicalAnalyzer:
                 'lower': pd.Series(prices)
             }
     
-    @log_execution_time
     def calculate_atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
         """ATR (Average True Range) 계산"""
         try:
-            atr_indicator = ta.volatility.AverageTrueRange(
-                high=high, low=low, close=close, window=period
-            )
-            return atr_indicator.average_true_range()
+            if len(close) < period:
+                logger.warning(f"ATR 계산용 데이터 부족: {len(close)} < {period}")
+                return self._constant_series(close, 0.01)
+            
+            high_values = high.to_numpy(dtype=np.float64)
+            low_values = low.to_numpy(dtype=np.float64)
+            close_values = close.to_numpy(dtype=np.float64)
+            if talib is not None:
+                atr = talib.ATR(high_values, low_values, close_values, timeperiod=period)
+                return pd.Series(np.nan_to_num(atr, nan=0.0), index=close.index)
+            
+            # True Range = max(고가-저가, |고가-전일종가|, |저가-전일종가|)
+            prev_close = np.concatenate(([np.nan], close_values[:-1]))
+            true_range = np.fmax(high_values - low_values,
+                                 np.fmax(np.abs(high_values - prev_close), np.abs(low_values - prev_close)))
+            
+            # Wilder 평활: 첫 period 구간 평균으로 시작하는 ewm(alpha=1/period)과 동일
+            seeded = true_range[period - 1:].copy()
+            seeded[0] = true_range[:period].mean()
+            atr = np.zeros(len(true_range))
+            atr[period - 1:] = pd.Series(seeded).ewm(alpha=1.0 / period, adjust=False).mean().to_numpy()
+            return pd.Series(atr, index=close.index)
         except Exception as e:
             logger.error(f"ATR 계산 오류: {e}")
-            return pd.Series([0.01] * len(close))
+            return self._constant_series(close, 0.01)
     
-    @log_execution_time
-    def calculate_stochastic(self, high: pd.Series, low: pd.Series, close: pd.Series) -> Dict[str, pd.Series]:
+    def _rolling_extremes(self, high: pd.Series, low: pd.Series, period: int) -> Tuple[pd.Series, pd.Series]:
+        """기간 내 최고가/최저가 (스토캐스틱, Williams %R 공용)"""
+        return high.rolling(period).max(), low.rolling(period).min()
+    
+    def calculate_stochastic(self, high: pd.Series, low: pd.Series, close: pd.Series,
+                             extremes: Optional[Tuple[pd.Series, pd.Series]] = None) -> Dict[str, pd.Series]:
         """스토캐스틱 계산"""
         try:
-            stoch_indicator = ta.momentum.StochasticOscillator(
-                high=high, low=low, close=close,
-                window=14, smooth_window=3
-            )
+            if talib is not None:
+                # ta의 stoch/stoch_signal과 같은 정의 (비평활 %K, %K의 3봉 단순평균)
+                slowk, slowd = (
+                    pd.Series(values, index=close.index)
+                    for values in talib.STOCHF(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                                               close.to_numpy(dtype=np.float64), fastk_period=14, fastd_period=3)
+                )
+                return {'slowk': slowk, 'slowd': slowd}
+            
+            highest_high, lowest_low = extremes or self._rolling_extremes(high, low, 14)
+            slowk = 100 * (close - lowest_low) / (highest_high - lowest_low)
             return {
-                'slowk': stoch_indicator.stoch(),
-                'slowd': stoch_indicator.stoch_signal()
+                'slowk': slowk,
+                'slowd': slowk.rolling(3).mean()
             }
         except Exception as e:
             logger.error(f"스토캐스틱 계산 오류: {e}")
-            return {
-                'slowk': pd.Series([50] * len(close)),
-                'slowd': pd.Series([50] * len(close))
-            }
+            neutral = self._constant_series(close, 50.0)
+            return {'slowk': neutral, 'slowd': neutral}
     
-    @log_execution_time
-    def calculate_williams_r(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
+    def calculate_williams_r(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14,
+                             extremes: Optional[Tuple[pd.Series, pd.Series]] = None) -> pd.Series:
         """Williams %R 계산"""
         try:
-            williams_r = ta.momentum.WilliamsRIndicator(
-                high=high, low=low, close=close, lbp=period
-            )
-            return williams_r.williams_r()
+            if talib is not None:
+                williams_r = talib.WILLR(high.to_numpy(dtype=np.float64), low.to_numpy(dtype=np.float64),
+                                         close.to_numpy(dtype=np.float64), timeperiod=period)
+                return pd.Series(williams_r, index=close.index)
+            
+            highest_high, lowest_low = extremes or self._rolling_extremes(high, low, period)
+            return -100 * (highest_high - close) / (highest_high - lowest_low)
         except Exception as e:
             logger.error(f"Williams %R 계산 오류: {e}")
-            return pd.Series([-50] * len(close))
+            return self._constant_series(close, -50.0)
     
-    @log_execution_time
     def calculate_volume_indicators(self, prices: pd.Series, volume: pd.Series) -> Dict[str, pd.Series]:
         """거래량 지표 계산"""
         try:
-            # OBV (On-Balance Volume)
-            obv_indicator = ta.volume.OnBalanceVolumeIndicator(
-                close=prices, volume=volume
-            )
-            obv = obv_indicator.on_balance_volume()
-            
-            # VWAP (Volume Weighted Average Price)
-            vwap = (prices * volume).cumsum() / volume.cumsum()
+            price_values = prices.to_numpy(dtype=np.float64)
+            volume_values = volume.to_numpy(dtype=np.float64)
+            
+            # OBV (On-Balance Volume): 종가 하락 시 -거래량, 그 외 +거래량 누적
+            obv = np.where(np.diff(price_values, prepend=np.nan) < 0, -volume_values, volume_values)
+            np.cumsum(obv, out=obv)
+            
+            # VWAP (Volume Weighted Average Price): 가격×거래량 누적합을 제자리 계산
+            # (pandas cumsum 처럼 NaN 은 누적에서 건너뛰고 해당 위치만 NaN 으로 유지)
+            vwap = price_values * volume_values
+            missing_pv = np.isnan(vwap)
+            np.nancumsum(vwap, out=vwap)
+            vwap[missing_pv] = np.nan
+            cumulative_volume = np.nancumsum(volume_values)
+            cumulative_volume[np.isnan(volume_values)] = np.nan
+            with np.errstate(divide='ignore', invalid='ignore'):
+                np.divide(vwap, cumulative_volume, out=vwap)
             
             return {
-                'obv': obv,
-                'vwap': vwap
+                'obv': pd.Series(obv, index=prices.index),
+                'vwap': pd.Series(vwap, index=prices.index)
             }
         except Exception as e:
             logger.error(f"거래량 지표 계산 오류: {e}")
             return {
-                'obv': pd.Series([0] * len(prices)),
+                'obv': self._constant_series(prices, 0.0),
                 'vwap': pd.Series(prices)
             }
     
-    @log_execution_time
     def calculate_moving_averages(self, prices: pd.Series) -> Dict[str, pd.Series]:
         """이동평균 계산"""
         try:
-            return {
-                'sma_5': ta.trend.SMAIndicator(close=prices, window=5).sma_indicator(),
-                'sma_10': ta.trend.SMAIndicator(close=prices, window=10).sma_indicator(),
-                'sma_20': ta.trend.SMAIndicator(close=prices, window=20).sma_indicator(),
-                'sma_50': ta.trend.SMAIndicator(close=prices, window=50).sma_indicator(),
-                'ema_5': ta.trend.EMAIndicator(close=prices, window=5).ema_indicator(),
-                'ema_10': ta.trend.EMAIndicator(close=prices, window=10).ema_indicator(),
-                'ema_20': ta.trend.EMAIndicator(close=prices, window=20).ema_indicator(),
-                'ema_50': ta.trend.EMAIndicator(close=prices, window=50).ema_indicator()
-            }
+            moving_averages = {}
+            
+            # 단순이동평균: 누적합 한 번으로 모든 기간 계산
+            # (NaN 은 누적합에서 제외하고 유효값 개수로 판정해 rolling 과 같이 NaN 이 구간을 벗어나면 복구)
+            close = prices.to_numpy(dtype=np.float64)
+            cumulative = np.concatenate(([0.0], np.nancumsum(close)))
+            valid_counts = np.concatenate(([0], np.cumsum(~np.isnan(close))))
+            for window in self.MA_WINDOWS:
+                sma = np.full(len(close), np.nan)
+                if len(close) >= window:
+                    window_valid = (valid_counts[window:] - valid_counts[:-window]) == window
+                    sma[window - 1:] = np.where(
+                        window_valid, (cumulative[window:] - cumulative[:-window]) / window, np.nan)
+                moving_averages[f'sma_{window}'] = pd.Series(sma, index=prices.index)
+            
+            # 지수이동평균
+            for window in self.MA_WINDOWS:
+                moving_averages[f'ema_{window}'] = prices.ewm(span=window, min_periods=window, adjust=False).mean()
+            
+            return moving_averages
         except Exception as e:
             logger.error(f"이동평균 계산 오류: {e}")
             return {}
     
-    @cache_result(cache_time=300)
+    def _indicator_cache_key(self, df: pd.DataFrame) -> Optional[tuple]:
+        """데이터프레임 내용 기반 캐시 키 (봉 수, 첫/마지막 인덱스, 마지막 봉 값)"""
+        if df.empty:
+            return None
+        return (len(df), df.index[0], df.index[-1], tuple(df.iloc[-1].tolist()))
+    
+    @log_execution_time
     def get_all_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
         """모든 지표 계산"""
+        try:
+            cache_key = self._indicator_cache_key(df)
+            cached = self._indicator_cache.get(cache_key)
+            if cached is not None:
+                self._indicator_cache.move_to_end(cache_key)
+                logger.debug("get_all_indicators 캐시 결과 반환")
+                return cached
+            
+            indicators = self._calculate_all_indicators(df)
+            if cache_key is not None and indicators:
+                self._indicator_cache[cache_key] = indicators
+                if len(self._indicator_cache) > self.INDICATOR_CACHE_SIZE:
+                    self._indicator_cache.popitem(last=False)
+            return indicators
+        except Exception as e:
+            logger.error(f"지표 계산 오류: {e}")
+            return {}
+    
+    def _calculate_all_indicators(self, df: pd.DataFrame) -> Dict[str, Any]:
+        """모든 지표 계산 (캐시 미사용)"""
         try:
             indicators = {}
             
+            # 가격은 float32로 계산 (임계값 비교에는 충분한 정밀도, 메모리 이동량 절반)
+            # 거래량은 OBV/VWAP 누적합 오차 방지를 위해 float64 유지
+            # TA-Lib은 float64 배열만 받으므로 사용 시에는 변환 왕복을 피하기 위해 원본 유지
+            if talib is None:
+                df = df.astype({column: np.float32 for column in self.PRICE_COLUMNS if column in df.columns},
+                               copy=False)
+            
+            # 컬럼 Series는 한 번만 추출해 모든 지표가 공유
+            high, low, close = df['high'], df['low'], df['close']
+            
             # 기본 지표
-            indicators['rsi'] = self.calculate_rsi(df['close'])
-            indicators['macd'] = self.calculate_macd(df['close'])
-            indicators['bb'] = self.calculate_bollinger_bands(df['close'])
-            indicators['atr'] = self.calculate_atr(df['high'], df['low'], df['close'])
-            indicators['stoch'] = self.calculate_stochastic(df['high'], df['low'], df['close'])
-            indicators['williams_r'] = self.calculate_williams_r(df['high'], df['low'], df['close'])
+            indicators['rsi'] = self.calculate_rsi(close)
+            indicators['macd'] = self.calculate_macd(close)
+            indicators['bb'] = self.calculate_bollinger_bands(close)
+            indicators['atr'] = self.calculate_atr(high, low, close)
+            
+            # 스토캐스틱/Williams %R은 같은 14봉 최고가/최저가를 공유 (TA-Lib 사용 시 불필요)
+            extremes = self._rolling_extremes(high, low, 14) if talib is None else None
+            indicators['stoch'] = self.calculate_stochastic(high, low, close, extremes=extremes)
+            indicators['williams_r'] = self.calculate_williams_r(high, low, close, extremes=extremes)
             
             # 거래량 지표
             if 'volume' in df.columns:
-                indicators['volume'] = self.calculate_volume_indicators(df['close'], df['volume'])
+                indicators['volume'] = self.calculate_volume_indicators(close, df['volume'])
             
             # 이동평균
-            indicators['ma'] = self.calculate_moving_averages(df['close'])
+            indicators['ma'] = self.calculate_moving_averages(close)
             
             return indicators
         except Exception as e:
             logger.error(f"지표 계산 오류: {e}")
             return {}
     
+    def init_stream(self, df: pd.DataFrame) -> bool:
+        """스트리밍 상태 초기화 (전체 데이터로 1회 계산, 이후 봉은 update_last로 O(1) 갱신)"""
+        try:
+            min_length = max(self.macd_slow, self.macd_signal) + 20
+            if len(df) < min_length:
+                logger.warning(f"스트리밍 초기화용 데이터 부족: {len(df)} < {min_length}")
+                return False
+            
+            high, low, close = df['high'], df['low'], df['close'].astype(np.float64)
+            volume = df['volume'] if 'volume' in df.columns else pd.Series(np.zeros(len(df)), index=df.index)
+            
+            # RSI Wilder 평균 (calculate_rsi와 동일한 평활)
+            delta = np.diff(close.to_numpy(), prepend=np.nan)
+            moves = pd.DataFrame({'gain': np.where(delta > 0, delta, 0.0),
+                                  'loss': np.where(delta < 0, -delta, 0.0)})
+            avg_gain, avg_loss = moves.ewm(alpha=self._rsi_alpha, adjust=False).mean().iloc[-1].tolist()
+            
+            # MACD EMA (calculate_macd와 동일한 워밍업 구간)
+            ema_fast = close.ewm(span=self.macd_fast, min_periods=self.macd_fast, adjust=False).mean()
+            ema_slow = close.ewm(span=self.macd_slow, min_periods=self.macd_slow, adjust=False).mean()
+            macd_signal = (ema_fast - ema_slow).ewm(span=self.macd_signal, min_periods=self.macd_signal,
+                                                    adjust=False).mean()
+            
+            bb_window = deque(close.iloc[-self.bb_period:].tolist(), maxlen=self.bb_period)
+            slowk = self.calculate_stochastic(high, low, close)['slowk']
+            
+            self._state = {
+                'prev_close': float(close.iloc[-1]),
+                'avg_gain': avg_gain,
+                'avg_loss': avg_loss,
+                'ema_fast': float(ema_fast.iloc[-1]),
+                'ema_slow': float(ema_slow.iloc[-1]),
+                'macd_signal': float(macd_signal.iloc[-1]),
+                'bb_window': bb_window,
+                'bb_sum': float(sum(bb_window)),
+                'bb_sumsq': float(sum(value * value for value in bb_window)),
+                'atr': float(self.calculate_atr(high, low, close).iloc[-1]),
+                'highs': deque(high.iloc[-14:].tolist(), maxlen=14),
+                'lows': deque(low.iloc[-14:].tolist(), maxlen=14),
+                'slowk': deque(slowk.iloc[-3:].tolist(), maxlen=3),
+                'obv': float(self.calculate_volume_indicators(close, volume)['obv'].iloc[-1]),
+                'cum_pv': float((close * volume).sum()),
+                'cum_volume': float(volume.sum())
+            }
+            return True
+        except Exception as e:
+            logger.error(f"스트리밍 상태 초기화 오류: {e}")
+            self._state = {}
+            return False
+    
+    def update_last(self, high: float, low: float, close: float, volume: float = 0.0) -> Dict[str, Any]:
+        """새 봉 1개로 스트리밍 상태 갱신 후 마지막 봉 지표 반환 (get_all_indicators와 같은 키, 이동평균 제외)"""
+        try:
+            if not self._state:
+                logger.warning("스트리밍 상태 없음 - init_stream 먼저 호출 필요")
+                return {}
+            
+            indicators = {
+                'rsi': self._update_rsi(close),
+                'macd': self._update_macd(close),
+                'bb': self._update_bb(close),
+                'atr': self._update_atr(high, low, close)
+            }
+            indicators['stoch'], indicators['williams_r'] = self._update_range_oscillators(high, low, close)
+            indicators['volume'] = self._update_volume(close, volume)
+            
+            self._state['prev_close'] = close
+            return indicators
+        except Exception as e:
+            logger.error(f"스트리밍 지표 갱신 오류: {e}")
+            return {}
+    
+    def _update_rsi(self, close: float) -> float:
+        """RSI Wilder 평균 1단계 갱신"""
+        state = self._state
+        delta = close - state['prev_close']
+        alpha = self._rsi_alpha
+        state['avg_gain'] += alpha * (max(delta, 0.0) - state['avg_gain'])
+        state['avg_loss'] += alpha * (max(-delta, 0.0) - state['avg_loss'])
+        if state['avg_loss'] == 0:
+            return 100.0
+        return 100.0 - 100.0 / (1.0 + state['avg_gain'] / state['avg_loss'])
+    
+    def _update_macd(self, close: float) -> Dict[str, float]:
+        """MACD EMA 1단계 갱신"""
+        state = self._state
+        state['ema_fast'] += self._k_fast * (close - state['ema_fast'])
+        state['ema_slow'] += self._k_slow * (close - state['ema_slow'])
+        macd = state['ema_fast'] - state['ema_slow']
+        state['macd_signal'] += self._k_signal * (macd - state['macd_signal'])
+        return {'macd': macd, 'signal': state['macd_signal'], 'histogram': macd - state['macd_signal']}
+    
+    def _update_bb(self, close: float) -> Dict[str, float]:
+        """볼린저 밴드 구간 합/제곱합 1단계 갱신 (빠지는 값 차감)"""
+        state = self._state
+        window = state['bb_window']
+        if len(window) == window.maxlen:
+            exiting = window[0]
+            state['bb_sum'] -= exiting
+            state['bb_sumsq'] -= exiting * exiting
+        window.append(close)
+        state['bb_sum'] += close
+        state['bb_sumsq'] += close * close
+        
+        count = len(window)
+        middle = state['bb_sum'] / count
+        band_width = np.sqrt(max(state['bb_sumsq'] / count - middle * middle, 0.0)) * self.bb_stddev
+        return {'upper': middle + band_width, 'middle': middle, 'lower': middle - band_width}
+    
+    def _update_atr(self, high: float, low: float, close: float, period: int = 14) -> float:
+        """ATR Wilder 평균 1단계 갱신"""
+        state = self._state
+        prev_close = state['prev_close']
+        true_range = max(high - low, abs(high - prev_close), abs(low - prev_close))
+        state['atr'] = (state['atr'] * (period - 1) + true_range) / period
+        return state['atr']
+    
+    def _update_range_oscillators(self, high: float, low: float, close: float) -> Tuple[Dict[str, float], float]:
+        """스토캐스틱/Williams %R 1단계 갱신 (14봉 최고가/최저가 공유)"""
+        state = self._state
+        state['highs'].append(high)
+        state['lows'].append(low)
+        highest_high = max(state['highs'])
+        lowest_low = min(state['lows'])
+        price_range = highest_high - lowest_low
+        if price_range == 0:
+            slowk, williams_r = np.nan, np.nan
+        else:
+            slowk = 100 * (close - lowest_low) / price_range
+            williams_r = -100 * (highest_high - close) / price_range
+        state['slowk'].append(slowk)
+        return {'slowk': slowk, 'slowd': sum(state['slowk']) / len(state['slowk'])}, williams_r
+    
+    def _update_volume(self, close: float, volume: float) -> Dict[str, float]:
+        """OBV/VWAP 누적값 1단계 갱신"""
+        state = self._state
+        state['obv'] += -volume if close < state['prev_close'] else volume
+        state['cum_pv'] += close * volume
+        state['cum_volume'] += volume
+        vwap = state['cum_pv'] / state['cum_volume'] if state['cum_volume'] else close
+        return {'obv': state['obv'], 'vwap': vwap}
+    
     def validate_signal_strength(self, signals: Dict[str, float], market_data: Dict[str, Any]) -> Dict[str, Any]:
         """다층 신호 검증 시스템"""
         try:
@@ -282,24 +550,15 @@ class TechnicalAnalyzer:
             if abs(combined_signal) < 0.1:
                 return 0.0
             
-            direction = 1 if combined_signal > 0 else -1
-            consistency_count = 0
-            total_checks = 0
-            
-            # 각 개별 신호들의 일관성 확인
-            signal_keys = ['rsi_signal', 'macd_signal', 'bb_signal', 'stoch_signal']
-            for key in signal_keys:
-                if key in signals:
-                    signal_value = signals[key]
-                    if abs(signal_value) > 0.1:  # 중립이 아닌 신호만 검사
-                        total_checks += 1
-                        if (direction > 0 and signal_value > 0) or (direction < 0 and signal_value < 0):
-                            consistency_count += 1
-            
-            if total_checks == 0:
+            direction_up = combined_signal > 0
+            
+            # 각 개별 신호들의 일관성 확인 (중립이 아닌 신호만 검사)
+            active_signals = [signals[key] for key in self.SIGNAL_KEYS
+                              if key in signals and abs(signals[key]) > 0.1]
+            if not active_signals:
                 return 0.0
             
-            return consistency_count / total_checks
+            return sum((value > 0) == direction_up for value in active_signals) / len(active_signals)
             
         except Exception as e:
             logger.error(f"시간대별 일관성 검증 실패: {e}")
@@ -346,14 +605,14 @@ class TechnicalAnalyzer:
                 return 0.5
             
             # 최근 20개 가격으로 트렌드 분석
-            prices = pd.Series(price_data[-20:])
+            prices = np.asarray(price_data[-20:], dtype=np.float64)
             
             # 1. 트렌드 강도 계산
-            price_change = (prices.iloc[-1] - prices.iloc[0]) / prices.iloc[0]
+            price_change = (prices[-1] - prices[0]) / prices[0]
             trend_strength = abs(price_change)
             
-            # 2. 변동성 계산
-            volatility = prices.pct_change().std()
+            # 2. 변동성 계산 (수익률 표본표준편차)
+            volatility = (np.diff(prices) / prices[:-1]).std(ddof=1)
             
             # 3. 체제 분류 및 점수 부여
             if trend_strength > 0.05 and volatility < 0.03:
@@ -389,12 +648,10 @@ class TechnicalAnalyzer:
             
             # 최근 3개 신호의 일관성 확인
             recent_signals = signal_history[-3:]
-            current_direction = 1 if combined_signal > 0 else -1
-            
-            consistent_count = 0
-            for historic_signal in recent_signals:
-                if (current_direction > 0 and historic_signal > 0) or (current_direction < 0 and historic_signal < 0):
-                    consistent_count += 1
+            if combined_signal > 0:
+                consistent_count = sum(historic_signal > 0 for historic_signal in recent_signals)
+            else:
+                consistent_count = sum(historic_signal < 0 for historic_signal in recent_signals)
             
             consistency_ratio = consistent_count / len(recent_signals)
             
@@ -410,106 +667,56 @@ class TechnicalAnalyzer:
             logger.error(f"노이즈 필터링 실패: {e}")
             return 0.5
 
+    @staticmethod
+    def _last_values(values: Any, count: int = 1) -> np.ndarray:
+        """지표의 마지막 count개 값 (Series/리스트/배열 공통, 개수 부족 시 빈 배열)"""
+        tail = np.asarray(values)[-count:].astype(np.float64)
+        return tail if tail.size == count else tail[:0]
+    
+    @staticmethod
+    def _tri_sign(value: float, lower: float, upper: float) -> float:
+        """하한 미만 +1, 상한 초과 -1, 그 외(NaN 포함) 0 - 분기 없는 3단 신호"""
+        return float(value < lower) - float(value > upper)
+    
     def generate_signals(self, indicators: Dict[str, Any]) -> Dict[str, float]:
         """거래 신호 생성"""
         try:
             signals = {}
             
-            # RSI 신호
-            if 'rsi' in indicators and len(indicators['rsi']) > 0:
-                rsi_current = indicators['rsi'].iloc[-1] if hasattr(indicators['rsi'], 'iloc') else indicators['rsi'][-1]
-                
-                # NaN 또는 무효한 값 처리
-                if pd.isna(rsi_current) or not isinstance(rsi_current, (int, float)):
-                    rsi_current = 50
-                
-                if rsi_current < self.rsi_oversold:
-                    signals['rsi_signal'] = 1.0  # 매수
-                elif rsi_current > self.rsi_overbought:
-                    signals['rsi_signal'] = -1.0  # 매도
-                else:
-                    signals['rsi_signal'] = 0.0  # 중립
-            else:
-                signals['rsi_signal'] = 0.0
-            
-            # MACD 신호
-            if 'macd' in indicators and 'histogram' in indicators['macd']:
-                macd_hist = indicators['macd']['histogram']
-                if len(macd_hist) >= 2:
-                    hist_current = macd_hist.iloc[-1] if hasattr(macd_hist, 'iloc') else macd_hist[-1]
-                    hist_prev = macd_hist.iloc[-2] if hasattr(macd_hist, 'iloc') else macd_hist[-2]
-                    
-                    # NaN 또는 무효한 값 처리
-                    if pd.isna(hist_current) or pd.isna(hist_prev):
-                        signals['macd_signal'] = 0.0
-                    elif hist_current > 0 and hist_prev <= 0:
-                        signals['macd_signal'] = 1.0  # 매수
-                    elif hist_current < 0 and hist_prev >= 0:
-                        signals['macd_signal'] = -1.0  # 매도
-                    else:
-                        signals['macd_signal'] = 0.0  # 중립
-                else:
-                    signals['macd_signal'] = 0.0
+            # 필요한 마지막 봉 값만 한 번에 ndarray로 추출
+            rsi = self._last_values(indicators.get('rsi', ()))
+            macd_hist = self._last_values(indicators.get('macd', {}).get('histogram', ()), 2)
+            bb_data = indicators.get('bb', {})
+            bb_last = [self._last_values(bb_data.get(key, ())) for key in ('middle', 'upper', 'lower')]
+            slowk = self._last_values(indicators.get('stoch', {}).get('slowk', ()))
+            
+            # RSI 신호: 과매도 매수(+1) / 과매수 매도(-1) / 중립(0), NaN은 비교가 모두 거짓이라 중립
+            signals['rsi_signal'] = self._tri_sign(rsi[0], self.rsi_oversold, self.rsi_overbought) if rsi.size else 0.0
+            
+            # MACD 신호: 히스토그램 0선 상향 돌파 매수 / 하향 돌파 매도
+            if macd_hist.size and not np.isnan(macd_hist).any():
+                hist_prev, hist_current = macd_hist
+                signals['macd_signal'] = (float(hist_current > 0 and hist_prev <= 0) -
+                                          float(hist_current < 0 and hist_prev >= 0))
             else:
                 signals['macd_signal'] = 0.0
             
-            # 볼린저 밴드 신호
-            if 'bb' in indicators:
-                bb_data = indicators['bb']
-                if (len(bb_data.get('lower', [])) > 0 and 
-                    len(bb_data.get('upper', [])) > 0 and 
-                    len(bb_data.get('middle', [])) > 0):
-                    
-                    current_price = bb_data['middle'].iloc[-1] if hasattr(bb_data['middle'], 'iloc') else bb_data['middle'][-1]
-                    upper_band = bb_data['upper'].iloc[-1] if hasattr(bb_data['upper'], 'iloc') else bb_data['upper'][-1]
-                    lower_band = bb_data['lower'].iloc[-1] if hasattr(bb_data['lower'], 'iloc') else bb_data['lower'][-1]
-                    
-                    # NaN 또는 무효한 값 처리
-                    if pd.isna(current_price) or pd.isna(upper_band) or pd.isna(lower_band):
-                        signals['bb_signal'] = 0.0
-                    elif current_price <= lower_band:
-                        signals['bb_signal'] = 1.0  # 매수
-                    elif current_price >= upper_band:
-                        signals['bb_signal'] = -1.0  # 매도
-                    else:
-                        signals['bb_signal'] = 0.0  # 중립
-                else:
+            # 볼린저 밴드 신호: 하단 이탈 매수(+1) / 상단 이탈 매도(-1) / 중립(0), 밴드 중 NaN이 있으면 중립
+            if all(values.size for values in bb_last):
+                current_price, upper_band, lower_band = (values[0] for values in bb_last)
+                if np.isnan(current_price) or np.isnan(upper_band) or np.isnan(lower_band):
                     signals['bb_signal'] = 0.0
-            else:
-                signals['bb_signal'] = 0.0
-            
-            # 스토캐스틱 신호
-            if 'stoch' in indicators and 'slowk' in indicators['stoch']:
-                stoch_data = indicators['stoch']
-                if len(stoch_data['slowk']) > 0:
-                    slowk = stoch_data['slowk'].iloc[-1] if hasattr(stoch_data['slowk'], 'iloc') else stoch_data['slowk'][-1]
-                    
-                    # NaN 또는 무효한 값 처리
-                    if pd.isna(slowk) or not isinstance(slowk, (int, float)):
-                        signals['stoch_signal'] = 0.0
-                    elif slowk < 20:
-                        signals['stoch_signal'] = 1.0  # 매수
-                    elif slowk > 80:
-                        signals['stoch_signal'] = -1.0  # 매도
-                    else:
-                        signals['stoch_signal'] = 0.0  # 중립
                 else:
-                    signals['stoch_signal'] = 0.0
+                    signals['bb_signal'] = float(current_price <= lower_band) - float(current_price >= upper_band)
             else:
-                signals['stoch_signal'] = 0.0
-            
-            # 종합 신호 계산 - 모든 신호 포함하여 평균 계산
-            valid_signals = [v for k, v in signals.items() if k.endswith('_signal') and isinstance(v, (int, float)) and not pd.isna(v)]
+                signals['bb_signal'] = 0.0
             
-            if valid_signals:
-                signals['combined_signal'] = sum(valid_signals) / len(valid_signals)
-            else:
-                signals['combined_signal'] = 0.0
+            # 스토캐스틱 신호: 20 미만 매수(+1) / 80 초과 매도(-1) / 중립(0), NaN은 중립
+            signals['stoch_signal'] = self._tri_sign(slowk[0], 20, 80) if slowk.size else 0.0
             
-            # 안전 검증: 모든 신호가 유효한 숫자인지 확인
-            for key, value in signals.items():
-                if pd.isna(value) or not isinstance(value, (int, float)):
-                    signals[key] = 0.0
+            # 종합 신호 계산 - 네 신호의 평균 (각 신호는 위에서 항상 유한한 float로 설정됨)
+            signals['combined_signal'] = 0.25 * (signals['rsi_signal'] + signals['macd_signal'] +
+                                                 signals['bb_signal'] + signals['stoch_signal'])
             
             return signals
         except Exception as e:
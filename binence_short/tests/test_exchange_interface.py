@@ -0,0 +1,94 @@
+"""
+거래소 인터페이스 테스트 (네트워크 없이 가짜 거래소 객체 사용)
+"""
+
+import sys
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.exchange_interface import ExchangeInterface
+
+
+class FakeExchange:
+    """호출 횟수를 세는 가짜 ccxt 거래소"""
+    
+    def __init__(self):
+        self.balance_calls = 0
+        self.ticker_calls = 0
+    
+    def load_markets(self):
+        return {'BTC/USDT': {}}
+    
+    def fetch_balance(self):
+        self.balance_calls += 1
+        return {
+            'total': {'USDT': 100.0, 'BTC': 0.5},
+            'free': {'USDT': 80.0, 'BTC': 0.5},
+            'used': {'USDT': 20.0, 'BTC': 0.0}
+        }
+    
+    def fetch_ticker(self, symbol):
+        self.ticker_calls += 1
+        return {'last': 50000.0, 'bid': 49990.0, 'ask': 50010.0, 'baseVolume': 10.0,
+                'change': 0.0, 'percentage': 0.0, 'timestamp': 0}
+
+
+def _make_exchange():
+    """가짜 현물 거래소를 연결한 인터페이스 생성"""
+    exchange = ExchangeInterface({'api_key': 'key', 'secret_key': 'secret'})
+    exchange.spot_exchange = FakeExchange()
+    return exchange
+
+
+def test_spot_balance_snapshot_is_reused_until_invalidated():
+    """TTL 안에서는 잔고를 다시 조회하지 않고, 무효화하면 다시 조회"""
+    exchange = _make_exchange()
+    
+    first = exchange.get_spot_balance()
+    second = exchange.get_spot_balance()
+    assert exchange.spot_exchange.balance_calls == 1
+    assert first == second
+    
+    exchange.invalidate_balance_cache()
+    exchange.get_spot_balance()
+    assert exchange.spot_exchange.balance_calls == 2
+
+
+def test_cached_balance_is_not_shared_with_callers():
+    """반환된 잔고를 수정해도 캐시된 스냅샷은 바뀌지 않음"""
+    exchange = _make_exchange()
+    
+    first = exchange.get_spot_balance()
+    first['free']['USDT'] = 0.0
+    first['total'] = {}
+    
+    second = exchange.get_spot_balance()
+    assert exchange.spot_exchange.balance_calls == 1
+    assert second['free']['USDT'] == 80.0
+    assert second['total']['USDT'] == 100.0
+
+
+def test_ticker_cache_returns_independent_copies():
+    """가격 정보는 TTL 동안 재사용하되 호출 측 수정이 캐시에 번지지 않음"""
+    exchange = _make_exchange()
+    
+    first = exchange.get_ticker('BTC/USDT')
+    first['last'] = 0.0
+    second = exchange.get_ticker('BTC/USDT')
+    
+    assert exchange.spot_exchange.ticker_calls == 1
+    assert second['last'] == 50000.0
+    assert second['symbol'] == 'BTC/USDT'
+
+
+def test_ticker_is_refetched_after_ttl():
+    """TTL 이 지난 가격 정보는 거래소에서 다시 조회"""
+    exchange = _make_exchange()
+    exchange.TICKER_CACHE_TTL = 0.0
+    
+    exchange.get_ticker('BTC/USDT')
+    exchange.get_ticker('BTC/USDT')
+    assert exchange.spot_exchange.ticker_calls == 2
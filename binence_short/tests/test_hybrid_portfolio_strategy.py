@@ -0,0 +1,63 @@
+"""
+하이브리드 포트폴리오 전략 테스트
+"""
+
+import sys
+from datetime import datetime, timedelta
+from pathlib import Path
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.hybrid_portfolio_strategy import HybridPortfolioStrategy
+
+
+def test_rebalancing_follows_runtime_setting_changes():
+    """같은 잔고라도 목표 배분/임계값을 바꾸면 즉시 판단에 반영"""
+    strategy = HybridPortfolioStrategy({'AUTO_TRANSFER_ENABLED': True, 'REBALANCE_THRESHOLD': 0.05})
+    state = {'total_balance': 1000.0, 'spot_balance': 400.0, 'futures_balance': 600.0}
+    
+    assert not strategy.check_rebalancing_needed(state)
+    
+    strategy.spot_allocation, strategy.futures_allocation = 0.6, 0.4
+    assert strategy.check_rebalancing_needed(state)
+    
+    strategy.rebalance_threshold = 0.5
+    assert not strategy.check_rebalancing_needed(state)
+
+
+def test_rebalancing_time_condition_uses_current_time():
+    """경과 시간 조건은 호출 시점 기준으로 평가 (캐시로 지연되지 않음)"""
+    strategy = HybridPortfolioStrategy({'AUTO_TRANSFER_ENABLED': True, 'REBALANCE_THRESHOLD': 0.05})
+    state = {'total_balance': 1000.0, 'spot_balance': 430.0, 'futures_balance': 570.0}
+    
+    strategy.last_rebalance = datetime.now()
+    assert not strategy.check_rebalancing_needed(state)
+    
+    strategy.last_rebalance = datetime.now() - timedelta(minutes=strategy.rebalance_interval_minutes + 1)
+    assert strategy.check_rebalancing_needed(state)
+
+
+def test_infinite_market_values_fall_back_to_defaults():
+    """무한대 가격/RSI는 기본값으로 대체되어 가짜 기회를 만들지 않음"""
+    strategy = HybridPortfolioStrategy({})
+    market_data = {
+        'BTC/USDT': {
+            'spot_ticker': {'last': float('inf')},
+            'futures_ticker': {'last': 100.0},
+        },
+        'ETH/USDT': {
+            'spot_ticker': {'last': 100.0},
+            'futures_ticker': {'last': 100.0},
+            'spot_signals': {'combined_signal': 0.0},
+            'futures_signals': {'combined_signal': 0.0},
+            'spot_indicators': {'rsi': {'current': float('-inf')}},
+            'futures_indicators': {'rsi': {'current': 20.0}},
+        },
+    }
+    
+    opportunities = strategy.analyze_market_opportunity(market_data)
+    
+    assert opportunities['arbitrage'] == []
+    assert opportunities['momentum'] == []
@@ -0,0 +1,134 @@
+"""
+리스크 관리 모듈 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules.risk_manager import RiskManager
+
+
+def _run_regime(config, log_returns):
+    """공개 API(포지션 가격 갱신 → 실시간 모니터링 → 리스크 요약)로 체제 변화 추적"""
+    risk_manager = RiskManager(config)
+    risk_manager.add_position('BTC/USDT', 'buy', 0.001, 100.0)
+    price = 100.0
+    regimes = []
+    for log_return in log_returns:
+        price *= float(np.exp(log_return))
+        risk_manager.update_position_risk('BTC/USDT', price)
+        risk_manager.real_time_risk_monitoring()
+        regimes.append(risk_manager.get_risk_summary()['market_regime'])
+    return regimes
+
+
+def test_monotonic_trend_is_trending():
+    """꾸준한 단조 상승 추세는 기준선이 따라붙어도 trending 으로 분류"""
+    regimes = _run_regime({}, np.full(400, 0.003))
+    assert regimes[-1] == 'trending'
+    assert all(regime == 'trending' for regime in regimes[50:])
+
+
+def test_sustained_volatility_is_volatile():
+    """지속되는 고변동성 구간은 volatile 로 분류"""
+    rng = np.random.default_rng(0)
+    regimes = _run_regime({}, 0.05 * rng.standard_normal(400))
+    assert regimes[-1] == 'volatile'
+
+
+def test_regime_holds_on_repeated_monitoring_without_new_price():
+    """새 가격 없이 모니터링만 반복해도 기준선이 따라붙어 체제가 바뀌지 않음"""
+    risk_manager = RiskManager({})
+    risk_manager.add_position('BTC/USDT', 'buy', 0.001, 100.0)
+    price = 100.0
+    for i in range(40):
+        # 횡보 후 완만한 추세 전환으로 현재 통계와 기준선이 벌어진 상태를 만든다
+        price *= 1.0 + (0.001 * (-1) ** i if i < 20 else 0.001)
+        risk_manager.update_position_risk('BTC/USDT', price)
+        risk_manager.real_time_risk_monitoring()
+    assert risk_manager.get_risk_summary()['market_regime'] == 'trending'
+    
+    for _ in range(50):
+        risk_manager.real_time_risk_monitoring()
+    assert risk_manager.get_risk_summary()['market_regime'] == 'trending'
+
+
+def test_hysteresis_holds_neutral_until_majority():
+    """첫 비중립 분류에서 바로 전환하지 않고 링버퍼 과반이 된 뒤에 전환"""
+    regimes = _run_regime({'regime_hysteresis': 16}, np.full(60, 0.003))
+    first_trending = regimes.index('trending')
+    
+    # 최소 표본(8개) 이후 첫 분류부터 9표가 쌓여야 중립 7표를 넘는다
+    assert first_trending == RiskManager.REGIME_MIN_SAMPLES - 1 + 8
+    assert all(regime == 'trending' for regime in regimes[first_trending:])
+
+
+def test_zero_hysteresis_is_clamped_to_one():
+    """regime_hysteresis 0 설정도 오류 없이 최소 크기 1 버퍼로 동작"""
+    regimes = _run_regime({'regime_hysteresis': 0}, np.full(20, 0.003))
+    assert regimes[RiskManager.REGIME_MIN_SAMPLES - 1] == 'trending'
+
+
+def test_positions_beyond_initial_capacity_are_tracked():
+    """초기 슬롯 수(max_positions)를 넘겨 추가해도 모든 포지션이 요약에 반영"""
+    risk_manager = RiskManager({'max_positions': 2})
+    for i in range(5):
+        risk_manager.add_position(f'COIN{i}/USDT', 'buy', 1.0, 10.0 * (i + 1))
+    risk_manager.add_position('BTC/USDT', 'sell', 0.5, 100.0, exchange_type='futures')
+    
+    summary = risk_manager.get_risk_summary()
+    assert summary['total_positions'] == 6
+    assert summary['total_position_value'] == 10.0 + 20.0 + 30.0 + 40.0 + 50.0 + 50.0
+    assert summary['short_position_value'] == 50.0
+    assert risk_manager.real_time_risk_monitoring()['risk_level'] != 'unknown'
+
+
+def test_batch_price_update_matches_summary_totals():
+    """일괄 가격 갱신 후 평가액/미실현 손익 합계가 포지션별 계산과 일치"""
+    risk_manager = RiskManager({'max_positions': 2})
+    risk_manager.add_position('BTC/USDT', 'buy', 2.0, 100.0)
+    risk_manager.add_position('ETH/USDT', 'sell', 3.0, 50.0, exchange_type='futures')
+    risk_manager.add_position('XRP/USDT', 'buy', 10.0, 1.0)
+    
+    risk_manager.update_positions_risk({'BTC/USDT': 110.0, 'ETH/USDT': 40.0, 'XRP/USDT': 0.5,
+                                        'DOGE/USDT': 0.1})
+    
+    summary = risk_manager.get_risk_summary()
+    assert summary['total_positions'] == 3
+    assert np.isclose(summary['total_position_value'], 2.0 * 110.0 + 3.0 * 40.0 + 10.0 * 0.5)
+    assert np.isclose(summary['total_unrealized_pnl'], 2.0 * 10.0 + 3.0 * 10.0 + 10.0 * -0.5)
+    assert np.isclose(summary['short_position_value'], 3.0 * 40.0)
+
+
+def test_removed_position_slot_is_reused():
+    """제거된 포지션은 요약에서 빠지고, 빈 슬롯에 새 포지션이 들어가도 기존 값이 섞이지 않음"""
+    risk_manager = RiskManager({'max_positions': 2})
+    risk_manager.add_position('BTC/USDT', 'buy', 1.0, 100.0)
+    risk_manager.add_position('ETH/USDT', 'sell', 2.0, 50.0, exchange_type='futures')
+    
+    risk_manager.remove_position('ETH/USDT')
+    risk_manager.remove_position('ETH/USDT')  # 없는 포지션 제거는 무시
+    summary = risk_manager.get_risk_summary()
+    assert summary['total_positions'] == 1
+    assert summary['total_position_value'] == 100.0
+    assert summary['short_position_value'] == 0.0
+    
+    risk_manager.add_position('XRP/USDT', 'buy', 10.0, 1.0)
+    risk_manager.update_positions_risk({'BTC/USDT': 90.0, 'XRP/USDT': 1.5})
+    summary = risk_manager.get_risk_summary()
+    assert summary['total_positions'] == 2
+    assert np.isclose(summary['total_position_value'], 90.0 + 15.0)
+    assert np.isclose(summary['total_unrealized_pnl'], -10.0 + 5.0)
+    
+    risk_manager.remove_position('BTC/USDT')
+    risk_manager.remove_position('XRP/USDT')
+    summary = risk_manager.get_risk_summary()
+    assert summary['total_positions'] == 0
+    assert summary['total_position_value'] == 0.0
+    assert summary['total_unrealized_pnl'] == 0.0
@@ -0,0 +1,150 @@
+"""
+기술적 분석 모듈 테스트
+"""
+
+import sys
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+import pytest
+
+# 프로젝트 루트를 Python 경로에 추가
+project_root = Path(__file__).parent.parent
+sys.path.insert(0, str(project_root))
+
+from modules import technical_analysis
+from modules.technical_analysis import TechnicalAnalyzer
+
+
+def _make_ohlcv(length=300, seed=0):
+    """무작위 보행 기반 OHLCV 데이터프레임 생성"""
+    rng = np.random.default_rng(seed)
+    close = 100.0 + rng.standard_normal(length).cumsum()
+    spread = rng.random(length) + 0.1
+    return pd.DataFrame({
+        'open': close + rng.standard_normal(length) * 0.1,
+        'high': close + spread,
+        'low': close - spread,
+        'close': close,
+        'volume': rng.random(length) * 10.0 + 1.0
+    }, index=pd.date_range('2024-01-01', periods=length, freq='h'))
+
+
+def test_vwap_recovers_after_nan_close():
+    """종가 NaN 이후에도 VWAP 이 pandas 누적합 기준값과 일치 (NaN 은 해당 봉에만 유지)"""
+    df = _make_ohlcv()
+    df.loc[df.index[150], 'close'] = np.nan
+    
+    vwap = TechnicalAnalyzer({}).calculate_volume_indicators(df['close'], df['volume'])['vwap']
+    expected = (df['close'] * df['volume']).cumsum() / df['volume'].cumsum()
+    
+    assert np.isnan(vwap.iloc[150])
+    assert not vwap.iloc[151:].isna().any()
+    np.testing.assert_allclose(vwap.to_numpy(), expected.to_numpy(), rtol=1e-12)
+
+
+def test_streaming_volume_matches_batch_with_nan_close():
+    """NaN 종가가 섞여도 update_last 의 OBV/VWAP 이 전체 재계산 결과와 일치"""
+    df = _make_ohlcv()
+    df.loc[df.index[150], 'close'] = np.nan
+    analyzer = TechnicalAnalyzer({})
+    
+    assert analyzer.init_stream(df.iloc[:-1])
+    last = df.iloc[-1]
+    streamed = analyzer.update_last(last['high'], last['low'], last['close'], last['volume'])['volume']
+    batch = analyzer.calculate_volume_indicators(df['close'], df['volume'])
+    
+    assert np.isclose(streamed['vwap'], batch['vwap'].iloc[-1], rtol=1e-12)
+    assert np.isclose(streamed['obv'], batch['obv'].iloc[-1], rtol=1e-12)
+
+
+@pytest.fixture(params=['talib', 'pandas'])
+def analyzer(request, monkeypatch):
+    """TA-Lib 경로와 pandas/NumPy 대체 경로 각각의 분석기"""
+    if request.param == 'pandas':
+        monkeypatch.setattr(technical_analysis, 'talib', None)
+    elif technical_analysis.talib is None:
+        pytest.skip("TA-Lib 미설치")
+    return TechnicalAnalyzer({})
+
+
+def _wilder(values, period):
+    """첫 period 구간 단순평균으로 시작하는 Wilder 평활 기준값"""
+    result = np.full(len(values), np.nan)
+    result[period - 1] = values[:period].mean()
+    for i in range(period, len(values)):
+        result[i] = (result[i - 1] * (period - 1) + values[i]) / period
+    return result
+
+
+def test_indicators_match_reference_values(analyzer):
+    """calculate_* 결과가 정의대로 계산한 기준값과 일치 (초기값 차이가 수렴한 구간 비교)"""
+    df = _make_ohlcv()
+    close, high, low = df['close'], df['high'], df['low']
+    tail = slice(-100, None)
+    
+    # RSI: Wilder 평활 상승/하락폭
+    delta = close.diff().to_numpy()[1:]
+    avg_gain = _wilder(np.where(delta > 0, delta, 0.0), 14)
+    avg_loss = _wilder(np.where(delta < 0, -delta, 0.0), 14)
+    expected_rsi = 100.0 - 100.0 / (1.0 + avg_gain / avg_loss)
+    rsi = analyzer.calculate_rsi(close).to_numpy()
+    np.testing.assert_allclose(rsi[1:][tail], expected_rsi[tail], rtol=1e-6)
+    
+    # MACD: EMA(12) - EMA(26), 시그널 EMA(9) (값 크기가 0 근처라 절대 오차로 비교)
+    expected_macd = close.ewm(span=12, adjust=False).mean() - close.ewm(span=26, adjust=False).mean()
+    expected_signal = expected_macd.ewm(span=9, adjust=False).mean()
+    macd = analyzer.calculate_macd(close)
+    np.testing.assert_allclose(macd['macd'].to_numpy()[tail], expected_macd.to_numpy()[tail], atol=1e-6)
+    np.testing.assert_allclose(macd['signal'].to_numpy()[tail], expected_signal.to_numpy()[tail], atol=1e-6)
+    np.testing.assert_allclose(macd['histogram'].to_numpy()[tail],
+                               (expected_macd - expected_signal).to_numpy()[tail], atol=1e-6)
+    
+    # 볼린저 밴드: 20봉 평균 ± 2 × 모표준편차
+    middle = close.rolling(20).mean()
+    width = close.rolling(20).std(ddof=0) * 2
+    bb = analyzer.calculate_bollinger_bands(close)
+    np.testing.assert_allclose(bb['middle'].to_numpy()[19:], middle.to_numpy()[19:], rtol=1e-9)
+    np.testing.assert_allclose(bb['upper'].to_numpy()[19:], (middle + width).to_numpy()[19:], rtol=1e-9)
+    np.testing.assert_allclose(bb['lower'].to_numpy()[19:], (middle - width).to_numpy()[19:], rtol=1e-9)
+    
+    # ATR: True Range 의 Wilder 평활
+    prev_close = close.shift()
+    true_range = pd.concat([high - low, (high - prev_close).abs(), (low - prev_close).abs()], axis=1).max(axis=1)
+    expected_atr = _wilder(true_range.to_numpy()[1:], 14)
+    atr = analyzer.calculate_atr(high, low, close).to_numpy()
+    np.testing.assert_allclose(atr[1:][tail], expected_atr[tail], rtol=1e-6)
+    
+    # 이동평균: 단순/지수
+    moving_averages = analyzer.calculate_moving_averages(close)
+    for window in TechnicalAnalyzer.MA_WINDOWS:
+        np.testing.assert_allclose(moving_averages[f'sma_{window}'].to_numpy()[window - 1:],
+                                   close.rolling(window).mean().to_numpy()[window - 1:], rtol=1e-9)
+        np.testing.assert_allclose(moving_averages[f'ema_{window}'].to_numpy()[window - 1:],
+                                   close.ewm(span=window, adjust=False).mean().to_numpy()[window - 1:],
+                                   rtol=1e-9)
+
+
+def test_streaming_update_matches_batch_recompute(analyzer):
+    """update_last 로 갱신한 마지막 봉 지표가 전체 재계산 결과와 일치"""
+    df = _make_ohlcv()
+    assert analyzer.init_stream(df.iloc[:-1])
+    
+    last = df.iloc[-1]
+    streamed = analyzer.update_last(last['high'], last['low'], last['close'], last['volume'])
+    close, high, low = df['close'], df['high'], df['low']
+    
+    assert np.isclose(streamed['rsi'], analyzer.calculate_rsi(close).iloc[-1], rtol=1e-6)
+    macd = analyzer.calculate_macd(close)
+    for key in ('macd', 'signal', 'histogram'):
+        assert np.isclose(streamed['macd'][key], macd[key].iloc[-1], atol=1e-6)
+    bb = analyzer.calculate_bollinger_bands(close)
+    for key in ('upper', 'middle', 'lower'):
+        assert np.isclose(streamed['bb'][key], bb[key].iloc[-1], rtol=1e-9)
+    assert np.isclose(streamed['atr'], analyzer.calculate_atr(high, low, close).iloc[-1], rtol=1e-6)
+    stoch = analyzer.calculate_stochastic(high, low, close)
+    assert np.isclose(streamed['stoch']['slowk'], stoch['slowk'].iloc[-1], rtol=1e-9)
+    assert np.isclose(streamed['stoch']['slowd'], stoch['slowd'].iloc[-1], rtol=1e-9)
+    assert np.isclose(streamed['williams_r'], analyzer.calculate_williams_r(high, low, close).iloc[-1],
+                      rtol=1e-9)
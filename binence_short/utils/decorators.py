@@ -2,6 +2,7 @@
 유틸리티 데코레이터 모듈
 """
 import time
+import logging
 import functools
 from typing import Callable, Any
 import ccxt
@@ -35,9 +36,14 @@ def retry_on_network_error(max_retries: int = 3, delay: float = 1.0):
     return decorator
 
 def log_execution_time(func: Callable) -> Callable:
-    """함수 실행 시간을 로그하는 데코레이터"""
+    """함수 실행 시간을 로그하는 데코레이터 (호출 시점에 DEBUG 로그가 비활성이면 측정 생략)"""
+    is_debug_enabled = logger.logger.isEnabledFor
+    
     @functools.wraps(func)
     def wrapper(*args, **kwargs) -> Any:
+        if not is_debug_enabled(logging.DEBUG):
+            return func(*args, **kwargs)
+        
         start_time = time.time()
         result = func(*args, **kwargs)
         end_time = time.time()